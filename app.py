@@ -1,17 +1,129 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import spearmanr
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import time
+import weakref
+import zipfile
+from contextlib import contextmanager
 
-# Mendeklarasikan urutan semester akademik secara global atau di dalam fungsi
-# Disesuaikan dengan urutan semester dari data Anda: "2011" hingga "2421"
-SEMESTER_URUT = ["2011","2021","2111","2121","2211","2221","2311","2321","2411","2421"]
+# Format kode semester akademik: dua digit tahun, 1 (ganjil) / 2 (genap), lalu satu digit akhiran.
+# Contoh: "2011" = ganjil 2020/2021, "2021" = genap 2020/2021. Urutan semester diturunkan dari data.
+POLA_KODE_SEMESTER = r"\d{2}[12]\d"
+
+# SEMESTER_MASK disimpan sebagai int64: bit ke-i untuk urutan[i], tanpa bit tanda, dan satu bit
+# disisakan untuk "semester berikutnya" setelah semester terakhir. Urutan yang lebih panjang ditolak.
+MAKS_SEMESTER_MASK = 62
+
+# Kode semester yang terpisah dari data lainnya oleh sedikitnya BATAS_CELAH_SEMESTER semester
+# tanpa baris sama sekali, dan hanya mencakup kurang dari BATAS_PROPORSI_TERPENCIL baris
+# transkrip, dianggap salah ketik dan tidak dimasukkan ke urutan semester
+BATAS_CELAH_SEMESTER = 2
+BATAS_PROPORSI_TERPENCIL = 0.01
+
+# Jumlah maksimum dataset yang hasil turunannya (kubus, Spearman, regresi) disimpan di cache server
+MAKS_CACHE_DATASET = 4
+
+# Anggaran memori registri dataset bersama lintas sesi (MB), dapat diatur lewat REGISTRI_DATASET_MB
+BATAS_MEMORI_REGISTRI_MB = float(os.environ.get("REGISTRI_DATASET_MB", 1024))
+
+# Jumlah maksimum gambar grafik yang disimpan di cache server (dipakai bersama seluruh sesi)
+MAKS_CACHE_GRAFIK = 128
+
+# Panel profil performa aktif secara default jika PROFIL_DASHBOARD=1
+PROFIL_DEFAULT = os.environ.get("PROFIL_DASHBOARD") == "1"
+
+# Jumlah fold validasi silang untuk evaluasi regresi
+JUMLAH_FOLD_CV = 5
+
+# Pilihan jumlah resampling bootstrap/permutasi Spearman dan batas elemen matriks per blok
+PILIHAN_RESAMPLING = [1000, 2000, 5000, 10000]
+MAKS_ELEMEN_BLOK_RESAMPLING = 4_000_000
+
+# Versi skema bundel dataset (.zip berisi tabel Arrow); naikkan bila kolom atau tipe frame hasil
+# preprocessing berubah sehingga bundel lama ditolak dan harus diekspor ulang dari file asli
+VERSI_SKEMA_BUNDEL = 1
+EKSTENSI_BUNDEL = ".zip"
+
+# --- Sumber Data ---
+# Nama sheet dan kolom yang benar-benar dipakai dalam analisis.
+# Sheet 'MataKuliah' tidak dipakai sehingga tidak dibaca sama sekali.
+SHEET_TRANSKRIP = 'Transkrip Mhs SI TA 2020-2024'
+SHEET_RESPONDEN = 'Responden'
+KOLOM_TRANSKRIP = ["NIM", "ANGKATAN", "SEMESTER_AMBIL", "IPS", "IPK", "SKS"]
+# Kolom tabel per mahasiswa (df1)
+KOLOM_MAHASISWA = [
+    "NIM", "ANGKATAN", "IPS", "IPK", "TOTAL_SKS", "SEMESTER_TERAKHIR",
+    "TOTAL_SEMESTER", "SEMESTER_MASK", "LAMA_KULIAH_TAHUN", "KELULUSAN_STATUS"
+]
+
+# Encoding jawaban survei yang berupa pilihan teks
+YA_TIDAK = {"Ya": 1, "Tidak": 0}
+ENCODE_TEMPAT_TINGGAL = {"Asrama": 1, "Bersama Saudara": 2, "Kontrakan": 3, "Kost": 4, "Orang tua": 5}
+ENCODE_PENDAPATAN = {"Tidak berpenghasilan": 0, "Kurang dari 1 juta": 1, "1 juta - 5 juta": 2, "5 juta - 10 juta": 3, "Lebih dari 10 juta": 4}
+ENCODE_UANG_SAKU = {"Kurang dari Rp 500.000": 0, "Rp 500.000 - Rp 1.000.000": 1, "Rp 1.000.000 - Rp 3.000.000": 2, "Lebih dari Rp 3.000.000": 3}
+
+# Skema survei: pertanyaan -> (nama kolom singkat, encoding jawaban).
+# Encoding None berarti jawaban sudah berupa angka (skala Likert) dan hanya diganti namanya.
+# Menambah pertanyaan cukup dengan menambah satu baris di sini.
+SKEMA_SURVEI = {
+    'Seberapa sering Anda mendapatkan dukungan dari keluarga dalam hal akademik?': ('dukungan_keluarga_akademik', None),
+    'Bagaimana kondisi ekonomi keluarga Anda memengaruhi prestasi akademik Anda?': ('kondisi_ekonomi_keluarga', None),
+    'Apakah tingkat pendidikan orang tua Anda mempengaruhi cara Anda belajar?': ('pendidikan_ortu_pengaruh', None),
+    'Seberapa sering Anda berdiskusi tentang masalah akademik dengan orang tua/wali?': ('diskusi_akademik_ortu', None),
+    'Seberapa puas Anda terhadap prodi yang Anda pilih ini?': ('kepuasan_prodi', None),
+    'Bagaimana Anda menilai beban finansial (biaya kuliah, biaya hidup) yang Anda rasakan?': ('beban_finansial', None),
+    'Seberapa besar pengaruh bimbingan akademik dari dosen terhadap prestasi akademik Anda?': ('pengaruh_bimbingan_dosen', None),
+    'Apakah dengan fisik Anda yang sekarang memengaruhi proses belajar Anda?': ('pengaruh_fisik_belajar', None),
+    'Seberapa baik Anda mengelola stres yang berhubungan dengan perkuliahan?': ('manajemen_stres', None),
+    'Seberapa baik Anda mengelola waktu antara kuliah, pekerjaan, dan kegiatan lain?': ('manajemen_waktu', None),
+    'Seberapa sering Anda pernah tidak hadir kuliah karena sulit membagi waktu antara kuliah dengan kegiatan lain?': ('frekuensi_tidak_hadir_kuliah', None),
+    'Seberapa sering Anda mendapatkan bimbingan akademik dari dosen?': ('frekuensi_bimbingan_dosen', None),
+    'Apakah Anda merasa puas dengan kualitas pengajaran dosen di jurusan Anda?': ('kualitas_pengajaran_dosen', None),
+    'Seberapa lengkap fasilitas pembelajaran yang tersedia di kampus Anda?': ('kelengkapan_fasilitas', None),
+    'Seberapa sering Anda menggunakan fasilitas pembelajaran di kampus?': ('frekuensi_penggunaan_fasilitas', None),
+    'Seberapa sering Anda mengalami gangguan saat belajar?': ('frekuensi_gangguan_belajar', None),
+    'Apakah Anda merasa beban tugas kuliah yang diberikan terlalu berat?': ('beban_tugas_kuliah', None),
+    'Tempat tinggal sekarang': ('tempat_tinggal_sekarang', ENCODE_TEMPAT_TINGGAL),
+    'Berapa pendapatan Ayah Anda per bulan?': ('pendapatan_ayah', ENCODE_PENDAPATAN),
+    'Berapa pendapatan Ibu Anda per bulan?': ('pendapatan_ibu', ENCODE_PENDAPATAN),
+    'Berapa uang saku Anda per bulan?': ('uang_saku', ENCODE_UANG_SAKU),
+    'Apakah Anda bekerja sambil kuliah?': ('bekerja_sambil_kuliah', YA_TIDAK),
+    'Apakah Anda mendapatkan dukungan finansial yang cukup dari keluarga untuk keperluan kuliah?': ('dukungan_keluarga_finansial', YA_TIDAK),
+    'Apakah uang saku Anda tersebut cukup untuk menghidupi Anda selama sebulan?': ('uang_saku_cukup', YA_TIDAK),
+    'Apakah keluarga mendukung Anda berkuliah di jurusan yang saat ini Anda jalani?': ('dukungan_keluarga_jurusan', YA_TIDAK),
+    'Apakah Jurusan yang Anda pilih sudah sesuai dengan keinginan diri sendiri?': ('kesesuaian_jurusan', YA_TIDAK),
+    'Apakah Anda mendapatkan dukungan finansial penuh dari keluarga untuk keperluan kuliah?': ('finansial_untuk_kuliah', YA_TIDAK),
+    'Apakah Anda memiliki keterbatasan fisik?': ('keterbatasan_fisik', YA_TIDAK),
+    'Apakah Anda memiliki akses yang baik terhadap layanan kesehatan?': ('akses_baik_kesehatan', YA_TIDAK),
+    'Apakah anda memiliki jaminan kesehatan?': ('jaminan_kesehatan', YA_TIDAK),
+    'Apakah Anda suka berolahraga?': ('suka_olahraga', YA_TIDAK),
+    'Apakah Anda memiliki kegiatan di luar kuliah yang mempengaruhi waktu belajar Anda?': ('kegiatan_luar_kuliah', YA_TIDAK),
+}
+
+# Turunan skema: pertanyaan Likert (hanya rename) dan pertanyaan yang di-encode
+RENAME_MAP = {pertanyaan: kolom for pertanyaan, (kolom, encoding) in SKEMA_SURVEI.items() if encoding is None}
+KOLOM_SURVEI_ENCODE = [pertanyaan for pertanyaan, (_, encoding) in SKEMA_SURVEI.items() if encoding is not None]
+
+KOLOM_RESPONDEN = ["NIM"] + list(RENAME_MAP) + KOLOM_SURVEI_ENCODE
+
+# Gunakan pembaca calamine (jauh lebih cepat dari openpyxl) jika tersedia
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None  # default pandas (openpyxl)
 
 # --- Definisi Kelompok Faktor (Sesuai Permintaan Anda) ---
 FAKTOR_GROUPS = {
@@ -35,140 +147,575 @@ FAKTOR_GROUPS = {
     ]
 }
 
+# --- Profil Performa (Opsional) ---
+# Instrumentasi per tahap: waktu, jumlah baris, dan perubahan memori proses. Hanya aktif
+# di thread (sesi) yang memanggil mulai_profil(), sehingga tanpa overhead saat dimatikan.
+logger = logging.getLogger("dashboard_mahasiswa")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+_profil = threading.local()
+
+def _memori_proses_mb():
+    """Resident memory proses saat ini (MB), dibaca dari /proc jika tersedia."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return float("nan")
+
+def mulai_profil():
+    _profil.catatan = []
+
+def selesai_profil():
+    catatan = getattr(_profil, "catatan", None) or []
+    _profil.catatan = None
+    return catatan
+
+@contextmanager
+def profil_tahap(nama, baris=None):
+    """Mengukur satu tahap; `info["baris"]` dapat diisi di dalam blok setelah data diketahui."""
+    catatan = getattr(_profil, "catatan", None)
+    info = {"tahap": nama, "baris": baris}
+    if catatan is None:
+        yield info
+        return
+
+    memori_awal = _memori_proses_mb()
+    mulai = time.perf_counter()
+    try:
+        yield info
+    finally:
+        info["detik"] = round(time.perf_counter() - mulai, 4)
+        info["memori_delta_mb"] = round(_memori_proses_mb() - memori_awal, 2)
+        catatan.append(info)
+        logger.info(json.dumps({"event": "profil_tahap", **info}, default=str))
+
+def tampilkan_profil(catatan):
+    """Tabel tahap yang terukur (tahap yang dilewati karena cache tidak tercatat)."""
+    if catatan:
+        st.dataframe(pd.DataFrame(catatan), hide_index=True)
+    else:
+        st.caption("Belum ada tahap yang diukur.")
+
+def profil_bagian(fungsi):
+    """Membungkus satu bagian (fragment) halaman agar diprofilkan sendiri bila profil aktif.
+
+    Rerun fragment tidak menjalankan main(), sehingga profil dimulai dan diselesaikan di
+    dalam bagian itu dan hasilnya ditampilkan di akhir bagian. Pada rerun penuh, tahap
+    bagian juga diteruskan ke catatan main() untuk panel sidebar.
+    """
+    @functools.wraps(fungsi)
+    def pembungkus(*args, **kwargs):
+        if not st.session_state.get("profil_aktif", PROFIL_DEFAULT):
+            return fungsi(*args, **kwargs)
+        luar = getattr(_profil, "catatan", None)
+        mulai_profil()
+        try:
+            hasil = fungsi(*args, **kwargs)
+        finally:
+            catatan = selesai_profil()
+            if luar is not None:
+                luar.extend(catatan)
+            _profil.catatan = luar
+        with st.expander("⏱️ Profil Performa Bagian Ini", expanded=False):
+            tampilkan_profil(catatan)
+        return hasil
+    return pembungkus
+
 # --- Fungsi Logika Perhitungan Status Kelulusan ---
-def urutkan_semester(lst):
-    return sorted(set(lst), key=lambda x: SEMESTER_URUT.index(str(x)) if str(x) in SEMESTER_URUT else 999)
+def urutan_semester_dari_data(kode):
+    """Menurunkan urutan semester akademik dari kode semester yang muncul di data.
+
+    Rentang dari semester paling awal hingga paling akhir diisi lengkap, sehingga semester
+    yang tidak diambil oleh siapa pun tetap mendapat posisi (penting untuk deteksi dropout).
+    Kode yang tidak sesuai POLA_KODE_SEMESTER tidak termasuk urutan.
+    """
+    kode = pd.Index(pd.unique(np.asarray(kode).astype(str)))
+    kode = kode[kode.str.fullmatch(POLA_KODE_SEMESTER)].sort_values()
+    if kode.empty:
+        return []
+
+    posisi = kode.str[:2].astype(int) * 2 + kode.str[2].astype(int) - 1
+    akhiran = kode.str[3].value_counts().idxmax()
+    per_posisi = pd.Series(kode).groupby(posisi).agg(list)
+    urutan = []
+    for p in range(posisi.min(), posisi.max() + 1):
+        urutan.extend(per_posisi.get(p, [f"{p // 2:02d}{p % 2 + 1}{akhiran}"]))
+    return urutan
+
+def saring_semester_terpencil(jumlah_baris):
+    """Memisahkan kode semester terpencil (kemungkinan salah ketik) dari urutan semester.
+
+    urutan_semester_dari_data mengisi setiap semester di antara kode terkecil dan terbesar,
+    sehingga satu kode seperti "2911" dapat memperpanjang urutan bertahun-tahun dan membuat
+    mahasiswa aktif tampak dropout. jumlah_baris adalah Series jumlah baris transkrip per
+    kode semester. Urutan dipecah menjadi blok pada celah BATAS_CELAH_SEMESTER semester atau
+    lebih tanpa baris; blok di luar blok terbesar yang barisnya kurang dari
+    BATAS_PROPORSI_TERPENCIL dikeluarkan.
+
+    Mengembalikan (urutan, terpencil, kosong): urutan semester yang dipakai, kode yang
+    dikeluarkan, dan semester dalam urutan yang diisi otomatis karena tidak memiliki baris.
+    """
+    jumlah = jumlah_baris.groupby(jumlah_baris.index.astype(str)).sum()
+    urutan_penuh = urutan_semester_dari_data(jumlah.index)
+
+    blok, celah = [[]], []
+    for kode in urutan_penuh:
+        if jumlah.get(kode, 0) == 0:
+            celah.append(kode)
+            continue
+        if len(celah) >= BATAS_CELAH_SEMESTER and blok[-1]:
+            blok.append([])
+        elif blok[-1]:
+            blok[-1].extend(celah)
+        celah = []
+        blok[-1].append(kode)
+
+    total = jumlah.sum()
+    baris_blok = [jumlah.reindex(b).sum() for b in blok]
+    utama = int(np.argmax(baris_blok))
+    terpencil = [
+        kode for i, b in enumerate(blok) if i != utama and baris_blok[i] < BATAS_PROPORSI_TERPENCIL * total
+        for kode in b if jumlah.get(kode, 0) > 0
+    ]
+    if not terpencil:
+        urutan = urutan_penuh
+    else:
+        urutan = urutan_semester_dari_data([k for k in jumlah.index[jumlah > 0] if k not in terpencil])
+    kosong = [kode for kode in urutan if jumlah.get(kode, 0) == 0]
+    return urutan, terpencil, kosong
+
+def periksa_batas_semester(urutan):
+    """Menolak urutan semester yang tidak muat di SEMESTER_MASK (lebih dari MAKS_SEMESTER_MASK)."""
+    if len(urutan) > MAKS_SEMESTER_MASK:
+        raise ValueError(
+            f"Urutan semester berisi {len(urutan)} semester ({urutan[0]} - {urutan[-1]}), melebihi batas "
+            f"{MAKS_SEMESTER_MASK} semester per dataset. Periksa kode SEMESTER_AMBIL yang salah ketik."
+        )
+
+def urutan_dataset(df):
+    """Urutan semester dataset yang sudah diproses, dibaca dari kategori SEMESTER_AMBIL."""
+    semester = df["SEMESTER_AMBIL"]
+    if isinstance(semester.dtype, pd.CategoricalDtype):
+        semester = semester.cat.categories
+    return urutan_semester_dari_data(semester)
+
+def urutan_semester(semester, urutan):
+    """Mengubah kode semester menjadi indeks urut di urutan.
+
+    Kode yang tidak dikenal diberi indeks len(urutan) agar selalu berada di urutan terakhir.
+    """
+    kode = pd.Categorical(semester.astype(str), categories=urutan).codes.astype(np.int64)
+    return np.where(kode < 0, len(urutan), kode)
+
+def hitung_semester_mahasiswa(df_transkrip, urutan):
+    """Menghitung semester yang diambil per NIM secara kolom (tanpa apply per baris).
+
+    Setiap mahasiswa mendapat SEMESTER_MASK, yaitu bitmask dengan bit ke-i menyala jika
+    semester urutan[i] diambil, serta IDX_TERAKHIR sebagai indeks semester terakhir.
+    Daftar semester per mahasiswa tidak disimpan sebagai list Python; gunakan
+    semester_dari_mask() bila daftar tersebut dibutuhkan.
+    """
+    periksa_batas_semester(urutan)
+    sem = df_transkrip[["NIM", "SEMESTER_AMBIL"]].drop_duplicates()
+    sem = sem.assign(ORDER=urutan_semester(sem["SEMESTER_AMBIL"], urutan))
+    sem = sem.sort_values(["NIM", "ORDER"], kind="stable")
+    dikenal = sem["ORDER"] < len(urutan)
+    sem["BIT"] = np.where(dikenal, np.left_shift(np.int64(1), np.where(dikenal, sem["ORDER"], 0)), 0)
+
+    g = sem.groupby("NIM", sort=True, observed=True)
+    return pd.DataFrame({
+        "SEMESTER_TERAKHIR": g["SEMESTER_AMBIL"].last(),
+        "TOTAL_SEMESTER": g.size(),
+        "IDX_TERAKHIR": g["ORDER"].last(),
+        "SEMESTER_MASK": g["BIT"].sum(),
+    })
+
+def ringkas_mahasiswa(df_transkrip, urutan):
+    """Ringkasan per NIM dari baris transkrip: angkatan, IPS/IPK terakhir, total SKS, dan semester."""
+    ringkasan = (
+        df_transkrip.groupby("NIM", observed=True)
+        .agg({
+            "ANGKATAN": "first",
+            "IPS" : "last",
+            "IPK" : "last",
+            "SKS": "sum"
+        })
+        .rename(columns={"SKS": "TOTAL_SKS"})
+    )
+    # Mengurutkan dan menghitung total semester (vektor per NIM)
+    return ringkasan.join(hitung_semester_mahasiswa(df_transkrip, urutan))
+
+def semester_dari_mask(semester_mask, urutan):
+    """Mengembalikan daftar kode semester (urut) yang bitnya menyala di SEMESTER_MASK."""
+    return [kode for i, kode in enumerate(urutan) if (int(semester_mask) >> i) & 1]
+
+def tentukan_status(total_sem, idx_terakhir, semester_mask, jumlah_semester):
+    """Menentukan status kelulusan seluruh mahasiswa sekaligus dengan operasi NumPy.
+
+    jumlah_semester adalah panjang urutan semester dataset.
+    """
+    total_sem = np.asarray(total_sem)
+    idx_terakhir = np.asarray(idx_terakhir)
+    semester_mask = np.asarray(semester_mask, dtype=np.int64)
+
+    # Dropout detection: semester setelah SEMESTER_TERAKHIR tidak diambil
+    # Asumsi: Jika semester berikutnya tidak diambil, dianggap Dropout/Non-aktif
+    ada_semester_berikut = idx_terakhir + 1 < jumlah_semester
+    bit_berikut = np.right_shift(semester_mask, np.where(ada_semester_berikut, idx_terakhir + 1, 0)) & 1
+    dropout = ada_semester_berikut & (bit_berikut == 0)
 
-def tentukan_status(row):
-    sem_ambil = row["SEMESTER_AMBIL"]
-    total_sem = row["TOTAL_SEMESTER"]
-    sem_terakhir = str(row["SEMESTER_TERAKHIR"])
-    
     # Kriteria Kelulusan
-    if total_sem == 7:
-        return "Lulus Lebih Awal"
-    elif total_sem == 8:
-        return "Lulus Tepat Waktu"
-    elif total_sem > 8:
-        return "Tidak Lulus Tepat Waktu"
-
-    # Dropout detection
-    if sem_terakhir in SEMESTER_URUT:
-        idx = SEMESTER_URUT.index(sem_terakhir)
-        if idx + 1 < len(SEMESTER_URUT):
-            sem_selanjutnya = SEMESTER_URUT[idx + 1]
-            if sem_selanjutnya not in sem_ambil:
-                # Asumsi: Jika semester berikutnya tidak diambil, dianggap Dropout/Non-aktif
-                return "Dropout/Non-aktif"
-    
-    return "Masih Aktif"
+    return np.select(
+        [total_sem == 7, total_sem == 8, total_sem > 8, dropout],
+        ["Lulus Lebih Awal", "Lulus Tepat Waktu", "Tidak Lulus Tepat Waktu", "Dropout/Non-aktif"],
+        default="Masih Aktif"
+    )
+
+# --- Tata Letak Memori Ringkas ---
+def _bulat_terkecil(kolom):
+    """Downcast kolom bilangan bulat ke int8/int16/int32 (Int8/Int16/Int32 nullable jika ada NaN).
+
+    Kolom non-numerik atau yang berisi pecahan dikembalikan apa adanya.
+    """
+    if not pd.api.types.is_numeric_dtype(kolom) or pd.api.types.is_bool_dtype(kolom):
+        return kolom
+    nilai = kolom.dropna().to_numpy(dtype=float)
+    if len(nilai) and not np.all(np.mod(nilai, 1) == 0):
+        return kolom
+
+    ada_nan = kolom.isna().any()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if len(nilai) == 0 or (nilai.min() >= info.min and nilai.max() <= info.max):
+            return kolom.astype(dtype.__name__.capitalize() if ada_nan else dtype)
+    return kolom
+
+def padatkan_transkrip(df, urutan):
+    """NIM dan SEMESTER_AMBIL menjadi categorical; ANGKATAN dan SKS menjadi integer kecil."""
+    return df.assign(
+        NIM=df["NIM"].astype("category"),
+        SEMESTER_AMBIL=kategori_semester(df["SEMESTER_AMBIL"], urutan),
+        ANGKATAN=_bulat_terkecil(df["ANGKATAN"]),
+        SKS=_bulat_terkecil(df["SKS"]),
+    )
+
+def padatkan_mahasiswa(df1, urutan):
+    """Kolom per mahasiswa dengan tipe sekecil mungkin; status dan semester terakhir categorical."""
+    return df1.assign(
+        ANGKATAN=_bulat_terkecil(df1["ANGKATAN"]),
+        TOTAL_SKS=_bulat_terkecil(df1["TOTAL_SKS"]),
+        TOTAL_SEMESTER=_bulat_terkecil(df1["TOTAL_SEMESTER"]),
+        SEMESTER_MASK=_bulat_terkecil(df1["SEMESTER_MASK"]),
+        SEMESTER_TERAKHIR=kategori_semester(df1["SEMESTER_TERAKHIR"], urutan),
+        LAMA_KULIAH_TAHUN=df1["LAMA_KULIAH_TAHUN"].astype(np.float32),
+        KELULUSAN_STATUS=df1["KELULUSAN_STATUS"].astype("category"),
+    )
+
+def padatkan_survei(data_master):
+    """Jawaban survei yang sudah di-encode (Likert, Ya/Tidak, kategori) menjadi int8/Int8."""
+    return data_master.assign(**{
+        kolom: _bulat_terkecil(data_master[kolom]) for kolom, _ in SKEMA_SURVEI.values() if kolom in data_master.columns
+    })
+
+def laporan_penghematan_memori(sebelum, sesudah):
+    """Tabel ukuran memori (deep) setiap frame sebelum dan sesudah dipadatkan."""
+    return _tabel_laporan_memori({
+        nama: (sebelum[nama].memory_usage(deep=True).sum(), sesudah[nama].memory_usage(deep=True).sum())
+        for nama in sebelum
+    })
+
+def perbarui_laporan_memori(laporan, lama, baru):
+    """Laporan memori untuk frame yang dibangun ulang dari frame padat (mis. setelah tambah semester).
+
+    Frame baru tidak memiliki versi sebelum dipadatkan, sehingga ukuran "Sebelum" diperkirakan
+    dari ukuran per baris pada laporan lama dikali jumlah baris frame baru; ukuran "Sesudah"
+    diukur langsung.
+    """
+    sebelum_mb = laporan.set_index("Frame")["Sebelum (MB)"]
+    return _tabel_laporan_memori({
+        nama: (
+            sebelum_mb[nama] * 2**20 * len(baru[nama]) / max(len(lama[nama]), 1),
+            baru[nama].memory_usage(deep=True).sum(),
+        )
+        for nama in baru
+    })
+
+def _tabel_laporan_memori(ukuran):
+    # ukuran: {nama frame: (byte sebelum, byte sesudah)}
+    baris = []
+    for nama, (awal, akhir) in ukuran.items():
+        baris.append({
+            "Frame": nama,
+            "Sebelum (MB)": round(awal / 2**20, 2),
+            "Sesudah (MB)": round(akhir / 2**20, 2),
+            "Hemat (MB)": round((awal - akhir) / 2**20, 2),
+            "Hemat (%)": round(100 * (awal - akhir) / awal, 1) if awal else 0.0,
+        })
+    return pd.DataFrame(baris)
+
+# --- Fungsi Pembacaan File ---
+def _pilih_kolom(kolom):
+    """Filter usecols: hanya kolom yang dibutuhkan, kolom yang tidak ada diabaikan."""
+    kolom = set(kolom)
+    return lambda c: c in kolom
+
+def _baca_parquet(f, kolom):
+    import pyarrow.parquet as pq
+    pf = pq.ParquetFile(f)
+    return pf.read(columns=[c for c in kolom if c in pf.schema_arrow.names]).to_pandas()
+
+def baca_tabel(uploaded_files):
+    """Membaca tabel transkrip dan responden dari workbook XLSX atau file CSV/Parquet terpisah.
+
+    File CSV/Parquet dikenali dari namanya ('transkrip' atau 'responden'); file lain
+    (mis. MataKuliah) diabaikan. Hanya kolom yang dibutuhkan yang dibaca.
+    """
+    if not isinstance(uploaded_files, list):
+        uploaded_files = [uploaded_files]
+
+    tabel = {}
+    for f in uploaded_files:
+        nama = os.path.basename(getattr(f, "name", "")).lower()
+        if nama.endswith((".csv", ".parquet")):
+            if "transkrip" in nama:
+                jenis, kolom = "transkrip", KOLOM_TRANSKRIP
+            elif "responden" in nama:
+                jenis, kolom = "responden", KOLOM_RESPONDEN
+            else:
+                continue
+            if nama.endswith(".csv"):
+                tabel[jenis] = pd.read_csv(f, usecols=_pilih_kolom(kolom))
+            else:
+                tabel[jenis] = _baca_parquet(f, kolom)
+        else:
+            with pd.ExcelFile(f, engine=EXCEL_ENGINE) as xls:
+                tabel["transkrip"] = xls.parse(SHEET_TRANSKRIP, usecols=_pilih_kolom(KOLOM_TRANSKRIP))
+                tabel["responden"] = xls.parse(SHEET_RESPONDEN, usecols=_pilih_kolom(KOLOM_RESPONDEN))
+
+    tidak_ada = [jenis for jenis in ("transkrip", "responden") if jenis not in tabel]
+    if tidak_ada:
+        raise ValueError(f"Tabel berikut tidak ditemukan pada file yang diunggah: {', '.join(tidak_ada)}")
+    return tabel["transkrip"], tabel["responden"]
+
+# --- Encoding Survei Berbasis Skema ---
+def encode_survei(df_responden):
+    """Mengubah tabel Responden mentah menjadi NIM + satu kolom numerik per pertanyaan SKEMA_SURVEI.
+
+    Setiap kolom di-encode sekali secara vektor (lookup kode kategori), sehingga biayanya
+    tetap per kolom berapa pun jumlah pertanyaannya. Jawaban yang tidak dikenal menjadi NaN.
+    Mengembalikan (tabel, peringatan) dengan peringatan untuk pertanyaan yang tidak ada di
+    file dan jawaban yang tidak ada di encoding.
+    """
+    hasil = {"NIM": df_responden["NIM"].to_numpy()}
+    peringatan = []
+    tidak_ada = []
+    for pertanyaan, (kolom, encoding) in SKEMA_SURVEI.items():
+        if pertanyaan not in df_responden.columns:
+            tidak_ada.append(pertanyaan)
+            continue
+        jawaban = df_responden[pertanyaan]
+        if encoding is None:
+            nilai = pd.to_numeric(jawaban, errors="coerce").to_numpy(dtype=float)
+        else:
+            kode = pd.Categorical(jawaban, categories=list(encoding)).codes
+            nilai = np.append(np.array(list(encoding.values()), dtype=float), np.nan)[kode]
+
+        tidak_dikenal = jawaban[np.isnan(nilai) & jawaban.notna().to_numpy()]
+        if len(tidak_dikenal):
+            contoh = ", ".join(map(repr, tidak_dikenal.astype(str).unique()[:5]))
+            peringatan.append(f"Warning: {len(tidak_dikenal)} jawaban tidak dikenal pada '{pertanyaan}' ({contoh}) dianggap kosong.")
+        hasil[kolom] = nilai
+
+    if tidak_ada:
+        peringatan.append(f"Warning: Pertanyaan survei berikut tidak ditemukan di sheet Responden: {'; '.join(tidak_ada)}.")
+    return pd.DataFrame(hasil), peringatan
+
+# --- Bundel Dataset Hasil Preprocessing ---
+# Bundel adalah ZIP tanpa kompresi berisi manifest.json dan satu file Arrow IPC per frame.
+# Data setiap anggota diratakan ke kelipatan 64 byte sehingga tabel dapat dibaca langsung
+# dari buffer file (memory-mapped untuk path di disk) tanpa menyalin atau preprocessing ulang.
+FRAME_BUNDEL = ["df", "df1", "data_master", "laporan_memori"]
+_PERATAAN_BUNDEL = 64
+_ID_EXTRA_PERATAAN = 0xD935  # ID extra field padding (sama seperti zipalign)
+
+def adalah_bundel(uploaded_file):
+    """True jika unggahan berupa satu file bundel dataset (.zip)."""
+    return not isinstance(uploaded_file, list) and getattr(uploaded_file, "name", "").lower().endswith(EKSTENSI_BUNDEL)
+
+def tulis_bundel(df, df1, data_master, laporan_memori, hash_sumber):
+    """Mengemas frame hasil preprocessing menjadi bytes bundel dengan versi skema dan hash sumber."""
+    import pyarrow as pa
+
+    manifest = {
+        "versi_skema": VERSI_SKEMA_BUNDEL,
+        "hash_sumber": hash_sumber,
+        "dibuat": datetime.now().isoformat(timespec="seconds"),
+        "baris": {},
+    }
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as zf:
+        for nama, frame in zip(FRAME_BUNDEL, (df, df1, data_master, laporan_memori)):
+            sink = pa.BufferOutputStream()
+            tabel = pa.Table.from_pandas(frame, preserve_index=False)
+            with pa.ipc.new_file(sink, tabel.schema) as writer:
+                writer.write_table(tabel)
+
+            info = zipfile.ZipInfo(f"{nama}.arrow", date_time=time.localtime()[:6])
+            # Local header = 30 byte + nama file + extra field; padding membuat awal data rata
+            awal_data = output.tell() + 30 + len(info.filename) + 4
+            padding = -awal_data % _PERATAAN_BUNDEL
+            info.extra = struct.pack("<HH", _ID_EXTRA_PERATAAN, padding) + bytes(padding)
+            zf.writestr(info, sink.getvalue().to_pybytes())
+            manifest["baris"][nama] = len(frame)
+        zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+    return output.getvalue()
+
+# Tipe kolom yang diharapkan pada frame bundel (jenis, bukan dtype persis, karena lebar
+# integer hasil padatkan_* bergantung pada rentang data)
+TIPE_KOLOM_BUNDEL = {
+    "df": {
+        "NIM": "kategori", "ANGKATAN": "bulat", "SEMESTER_AMBIL": "kategori",
+        "IPS": "angka", "IPK": "angka", "SKS": "angka",
+    },
+    "df1": {
+        "ANGKATAN": "bulat", "IPS": "angka", "IPK": "angka", "TOTAL_SKS": "angka",
+        "SEMESTER_TERAKHIR": "kategori", "TOTAL_SEMESTER": "bulat", "SEMESTER_MASK": "bulat",
+        "LAMA_KULIAH_TAHUN": "angka", "KELULUSAN_STATUS": "kategori",
+    },
+    "data_master": {"IPK": "angka", "IPS": "angka"},
+}
+_CEK_TIPE = {
+    "kategori": lambda dtype: isinstance(dtype, pd.CategoricalDtype),
+    "bulat": pd.api.types.is_integer_dtype,
+    "angka": lambda dtype: pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype),
+}
+
+def _buffer_bundel(sumber):
+    """Buffer Arrow atas seluruh isi bundel: memory-mapped untuk path, tanpa salinan untuk file unggahan."""
+    import pyarrow as pa
+
+    if isinstance(sumber, (str, os.PathLike)):
+        return pa.memory_map(os.fspath(sumber)).read_buffer()
+    # getvalue() mengembalikan bytes yang dibagi BytesIO (copy-on-write); getbuffer() memaksanya disalin
+    return pa.py_buffer(sumber.getvalue() if hasattr(sumber, "getvalue") else sumber.read())
+
+def _direktori_bundel(buffer):
+    """Membaca direktori ZIP dan manifest bundel langsung dari buffer; mengembalikan (anggota, manifest)."""
+    import pyarrow as pa
+
+    with zipfile.ZipFile(pa.BufferReader(buffer)) as zf:
+        anggota = {info.filename: info for info in zf.infolist()}
+        if "manifest.json" not in anggota:
+            raise ValueError("File bukan bundel dataset: manifest.json tidak ditemukan.")
+        manifest = json.loads(zf.read("manifest.json"))
+    if manifest.get("versi_skema") != VERSI_SKEMA_BUNDEL:
+        raise ValueError(
+            f"Bundel memakai versi skema {manifest.get('versi_skema')}, sedangkan aplikasi memakai versi "
+            f"{VERSI_SKEMA_BUNDEL}. Unggah file data asli lalu ekspor ulang bundelnya."
+        )
+    return anggota, manifest
+
+def _periksa_frame_bundel(nama, tabel):
+    """Menolak frame bundel yang kolom atau tipe kolomnya tidak sesuai skema aplikasi."""
+    tipe = dict(TIPE_KOLOM_BUNDEL[nama])
+    if nama == "data_master":
+        # NIM, IPK, IPS wajib ada; kolom lain hanya boleh kolom survei dan harus numerik
+        kolom_survei = {kolom for kolom, _ in SKEMA_SURVEI.values()}
+        sesuai = {"NIM", "IPK", "IPS"} <= set(tabel.columns) and set(tabel.columns) <= {"NIM", "IPK", "IPS"} | kolom_survei
+        tipe.update({kolom: "angka" for kolom in tabel.columns if kolom in kolom_survei})
+    else:
+        sesuai = list(tabel.columns) == (KOLOM_TRANSKRIP if nama == "df" else KOLOM_MAHASISWA)
+    if not sesuai:
+        raise ValueError(f"Kolom tabel '{nama}' pada bundel tidak sesuai skema aplikasi.")
+
+    salah = [f"{kolom} ({tabel[kolom].dtype})" for kolom, jenis in tipe.items() if not _CEK_TIPE[jenis](tabel[kolom].dtype)]
+    if salah:
+        raise ValueError(f"Tipe kolom tabel '{nama}' pada bundel tidak sesuai skema aplikasi: {', '.join(salah)}.")
+
+def baca_bundel(sumber):
+    """Membaca bundel dari path (memory-mapped) atau file unggahan tanpa preprocessing.
+
+    Mengembalikan (df, df1, data_master, laporan_memori, manifest). Frame berbagi memori
+    dengan buffer bundel sehingga harus diperlakukan read-only. Bundel dengan versi skema
+    lain, atau kolom dan tipe kolom yang tidak sesuai, ditolak dengan ValueError.
+    hash_sumber di manifest hanya informasi asal data dan tidak diverifikasi.
+    """
+    import pyarrow as pa
+
+    buffer = _buffer_bundel(sumber)
+    anggota, manifest = _direktori_bundel(buffer)
+
+    frame = []
+    for nama in FRAME_BUNDEL:
+        info = anggota.get(f"{nama}.arrow")
+        if info is None or info.compress_type != zipfile.ZIP_STORED:
+            raise ValueError(f"Bundel tidak lengkap atau rusak: tabel '{nama}' tidak dapat dibaca.")
+        panjang_nama, panjang_extra = struct.unpack("<HH", buffer.slice(info.header_offset + 26, 4).to_pybytes())
+        awal = info.header_offset + 30 + panjang_nama + panjang_extra
+        tabel = pa.ipc.open_file(buffer.slice(awal, info.file_size)).read_all().to_pandas(split_blocks=True)
+        if nama in TIPE_KOLOM_BUNDEL:
+            _periksa_frame_bundel(nama, tabel)
+        frame.append(tabel)
+
+    df, df1, data_master, laporan_memori = frame
+    return df, df1, data_master, laporan_memori, manifest
 
 # --- Fungsi untuk Memuat Data ---
-def load_data(uploaded_file):
-    """Memuat data dari file XLSX dan melakukan preprocessing lengkap."""
-    try:
-        # Pemuatan Data Sesuai Permintaan Anda
-        df_transkrip = pd.read_excel(uploaded_file, sheet_name='Transkrip Mhs SI TA 2020-2024') # Digunakan untuk IPK/IPS/Angkatan
-        df_mk = pd.read_excel(uploaded_file, sheet_name='MataKuliah') # Digunakan untuk Semester Ambil dan IPS per Semester
-        df_responden = pd.read_excel(uploaded_file, sheet_name='Responden') # Digunakan untuk Faktor Survei
-        
-        # --- LANGKAH 1: PREPROCESSING df_transkrip (untuk Visualisasi Tren IPS) ---
-        df_transkrip['ANGKATAN'] = df_transkrip['ANGKATAN'].astype(int)
-        df = df_transkrip.copy() # df digunakan untuk visualisasi
-        
-        # --- LANGKAH 2: PERHITUNGAN STATUS KELULUSAN (Menghasilkan df1) ---
-        # Bikin jadi per mahasiswa based NIM (df1)
-        df1 = (
-            df_transkrip.groupby("NIM", as_index=False)
-            .agg({
-                "NIM": "first",
-                "ANGKATAN": "first",
-                "SEMESTER_AMBIL": list,
-                "IPS" : "last",
-                "IPK" : "last",
-                "SKS": "sum"
-            })
-            .rename(columns={"SKS": "TOTAL_SKS"})
+def proses_data(uploaded_file):
+    """Memuat data dan melakukan preprocessing lengkap tanpa menampilkan apa pun di halaman.
+
+    Mengembalikan (df, df1, data_master, peringatan, laporan_memori); kesalahan dilempar
+    sebagai exception.
+    Dipakai oleh load_data dan oleh analisis batch (batch_analisis.py).
+    """
+    # Pemuatan Data: hanya sheet Transkrip (IPK/IPS/Angkatan) dan Responden (Faktor Survei)
+    with profil_tahap("load_data/baca_tabel") as info:
+        df_transkrip, df_responden = baca_tabel(uploaded_file)
+        info["baris"] = len(df_transkrip) + len(df_responden)
+    
+    # --- LANGKAH 1: PREPROCESSING df_transkrip (untuk Visualisasi Tren IPS) ---
+    df_transkrip['ANGKATAN'] = df_transkrip['ANGKATAN'].astype(int)
+
+    # Urutan semester dari data; kode terpencil (kemungkinan salah ketik) tidak ikut dianalisis
+    peringatan_semester = []
+    kode_semester = df_transkrip["SEMESTER_AMBIL"].astype(str)
+    urutan, terpencil, kosong = saring_semester_terpencil(kode_semester.value_counts())
+    if terpencil:
+        buang = kode_semester.isin(terpencil).to_numpy()
+        df_transkrip = df_transkrip[~buang].reset_index(drop=True)
+        peringatan_semester.append(
+            f"Warning: {buang.sum()} baris transkrip dengan kode semester {', '.join(terpencil)} terpisah jauh dari "
+            "semester lainnya (kemungkinan salah ketik) sehingga diabaikan."
+        )
+    if kosong:
+        peringatan_semester.append(
+            f"Warning: Semester {', '.join(kosong)} tidak memiliki baris transkrip sama sekali tetapi berada di "
+            "antara semester lain, sehingga mahasiswa yang tidak mengambilnya dapat terhitung Dropout/Non-aktif."
         )
-        
-        # Mengurutkan dan menghitung total semester
-        df1["SEMESTER_AMBIL"] = df1["SEMESTER_AMBIL"].apply(urutkan_semester)
-        df1["SEMESTER_TERAKHIR"] = df1["SEMESTER_AMBIL"].apply(lambda x: x[-1])
-        df1["TOTAL_SEMESTER"] = df1["SEMESTER_AMBIL"].apply(len)
+    df = df_transkrip.copy() # df digunakan untuk visualisasi
+    
+    # --- LANGKAH 2: PERHITUNGAN STATUS KELULUSAN (Menghasilkan df1) ---
+    with profil_tahap("load_data/status_kelulusan", baris=len(df_transkrip)):
+        # Bikin jadi per mahasiswa based NIM (df1)
+        df1 = ringkas_mahasiswa(df_transkrip, urutan).reset_index()
         df1["LAMA_KULIAH_TAHUN"] = df1["TOTAL_SEMESTER"] / 2
-        
+    
         # Menerapkan fungsi status kelulusan
-        df1["KELULUSAN_STATUS"] = df1.apply(tentukan_status, axis=1)
-
-        # --- LANGKAH 3: PENGGABUNGAN DATA (Menghasilkan data_master) ---
-        
-        # 3.1 Mapping Rename
-        rename_map = {
-            'Seberapa sering Anda mendapatkan dukungan dari keluarga dalam hal akademik?': 'dukungan_keluarga_akademik',
-            'Bagaimana kondisi ekonomi keluarga Anda memengaruhi prestasi akademik Anda?': 'kondisi_ekonomi_keluarga',
-            'Apakah tingkat pendidikan orang tua Anda mempengaruhi cara Anda belajar?': 'pendidikan_ortu_pengaruh',
-            'Seberapa sering Anda berdiskusi tentang masalah akademik dengan orang tua/wali?': 'diskusi_akademik_ortu',
-            'Seberapa puas Anda terhadap prodi yang Anda pilih ini?': 'kepuasan_prodi',
-            'Bagaimana Anda menilai beban finansial (biaya kuliah, biaya hidup) yang Anda rasakan?': 'beban_finansial',
-            'Seberapa besar pengaruh bimbingan akademik dari dosen terhadap prestasi akademik Anda?': 'pengaruh_bimbingan_dosen',
-            'Apakah dengan fisik Anda yang sekarang memengaruhi proses belajar Anda?': 'pengaruh_fisik_belajar',
-            'Seberapa baik Anda mengelola stres yang berhubungan dengan perkuliahan?': 'manajemen_stres',
-            'Seberapa baik Anda mengelola waktu antara kuliah, pekerjaan, dan kegiatan lain?': 'manajemen_waktu',
-            'Seberapa sering Anda pernah tidak hadir kuliah karena sulit membagi waktu antara kuliah dengan kegiatan lain?': 'frekuensi_tidak_hadir_kuliah',
-            'Seberapa sering Anda mendapatkan bimbingan akademik dari dosen?': 'frekuensi_bimbingan_dosen',
-            'Apakah Anda merasa puas dengan kualitas pengajaran dosen di jurusan Anda?': 'kualitas_pengajaran_dosen',
-            'Seberapa lengkap fasilitas pembelajaran yang tersedia di kampus Anda?': 'kelengkapan_fasilitas',
-            'Seberapa sering Anda menggunakan fasilitas pembelajaran di kampus?': 'frekuensi_penggunaan_fasilitas',
-            'Seberapa sering Anda mengalami gangguan saat belajar?': 'frekuensi_gangguan_belajar',
-            'Apakah Anda merasa beban tugas kuliah yang diberikan terlalu berat?': 'beban_tugas_kuliah'
-        }
-        df_responden = df_responden.rename(columns=rename_map)
-
-        # 3.2 Encoding Variabel Kategorikal untuk Uji Statistik
-        encode_tempattinggal = {"Asrama": 1, "Bersama Saudara": 2, "Kontrakan": 3, "Kost": 4, "Orang tua": 5}
-        df_responden['tempat_tinggal_sekarang'] = df_responden['Tempat tinggal sekarang'].map(encode_tempattinggal)
-        
-        encode_pendapatan = {"Tidak berpenghasilan": 0, "Kurang dari 1 juta": 1, "1 juta - 5 juta": 2, "5 juta - 10 juta": 3, "Lebih dari 10 juta": 4}
-        df_responden["pendapatan_ayah"] = df_responden["Berapa pendapatan Ayah Anda per bulan?"].map(encode_pendapatan)
-        df_responden["pendapatan_ibu"] = df_responden["Berapa pendapatan Ibu Anda per bulan?"].map(encode_pendapatan)
-        
-        encode_uangsaku = {"Kurang dari Rp 500.000": 0, "Rp 500.000 - Rp 1.000.000": 1, "Rp 1.000.000 - Rp 3.000.000": 2, "Lebih dari Rp 3.000.000": 3}
-        df_responden["uang_saku"] = df_responden["Berapa uang saku Anda per bulan?"].map(encode_uangsaku)
-
-        encode_kerjakuliah = {"Ya": 1, "Tidak": 0}
-        df_responden['bekerja_sambil_kuliah'] = df_responden['Apakah Anda bekerja sambil kuliah?'].map(encode_kerjakuliah)
-
-        encode_dukunganfinansial = {"Ya": 1, "Tidak": 0}
-        df_responden['dukungan_keluarga_finansial'] = df_responden['Apakah Anda mendapatkan dukungan finansial yang cukup dari keluarga untuk keperluan kuliah?'].map(encode_dukunganfinansial)
-        
-        encode_uangsaku = {"Ya": 1, "Tidak": 0}
-        df_responden['uang_saku_cukup'] = df_responden['Apakah uang saku Anda tersebut cukup untuk menghidupi Anda selama sebulan?'].map(encode_uangsaku)
-        
-        encode_dukunganjurusan = {"Ya": 1, "Tidak": 0}
-        df_responden['dukungan_keluarga_jurusan'] = df_responden['Apakah keluarga mendukung Anda berkuliah di jurusan yang saat ini Anda jalani?'].map(encode_dukunganjurusan)
-        
-        encode_jurusansesuai = {"Ya": 1, "Tidak": 0}
-        df_responden['kesesuaian_jurusan'] = df_responden['Apakah Jurusan yang Anda pilih sudah sesuai dengan keinginan diri sendiri?'].map(encode_jurusansesuai)
-        
-        encode_finansial = {"Ya": 1, "Tidak": 0}
-        df_responden['finansial_untuk_kuliah'] = df_responden['Apakah Anda mendapatkan dukungan finansial penuh dari keluarga untuk keperluan kuliah?'].map(encode_finansial)
-        
-        encode_keterbatasan = {"Ya": 1, "Tidak": 0}
-        df_responden['keterbatasan_fisik'] = df_responden['Apakah Anda memiliki keterbatasan fisik?'].map(encode_keterbatasan)
-        
-        encode_aksesbaik = {"Ya": 1, "Tidak": 0}
-        df_responden['akses_baik_kesehatan'] = df_responden['Apakah Anda memiliki akses yang baik terhadap layanan kesehatan?'].map(encode_aksesbaik)
-        
-        encode_jaminankesehatan = {"Ya": 1, "Tidak": 0}
-        df_responden['jaminan_kesehatan'] = df_responden['Apakah anda memiliki jaminan kesehatan?'].map(encode_jaminankesehatan)
-        
-        encode_olahraga = {"Ya": 1, "Tidak": 0}
-        df_responden['suka_olahraga'] = df_responden['Apakah Anda suka berolahraga?'].map(encode_olahraga)
-        
-        encode_kegiatan = {"Ya": 1, "Tidak": 0}
-        df_responden['kegiatan_luar_kuliah'] = df_responden['Apakah Anda memiliki kegiatan di luar kuliah yang mempengaruhi waktu belajar Anda?'].map(encode_kegiatan)
-        
-        
+        df1["KELULUSAN_STATUS"] = tentukan_status(df1["TOTAL_SEMESTER"], df1["IDX_TERAKHIR"], df1["SEMESTER_MASK"], len(urutan))
+        df1 = df1[KOLOM_MAHASISWA]
+
+    # --- LANGKAH 3: PENGGABUNGAN DATA (Menghasilkan data_master) ---
+    
+    with profil_tahap("load_data/encoding_survei", baris=len(df_responden)):
+        # 3.1-3.2 Rename dan encoding seluruh pertanyaan survei sesuai SKEMA_SURVEI
+        df_responden, peringatan = encode_survei(df_responden)
+        peringatan = peringatan_semester + peringatan
+
+    with profil_tahap("load_data/merge") as info:
         # 3.3 Merge Akhir: Survei + Hasil Perhitungan IPK/IPS/Status
         data_master = pd.merge(
             df_responden, 
@@ -176,54 +723,860 @@ def load_data(uploaded_file):
             on='NIM', 
             how='inner'
         )
-        
-        # Clean up data_master (Drop kolom yang sudah di-encode/tidak perlu)
-        data_master = data_master.drop(columns=[
-            "Berapa pendapatan Ayah Anda per bulan?",
-            "Berapa pendapatan Ibu Anda per bulan?",
-            "Berapa uang saku Anda per bulan?",
-            "Tempat tinggal sekarang"
-            "Apakah Anda bekerja sambil kuliah?",
-            "Apakah Anda mendapatkan dukungan finansial yang cukup dari keluarga untuk keperluan kuliah?",
-            "Apakah uang saku Anda tersebut cukup untuk menghidupi Anda selama sebulan?",
-            "Apakah keluarga mendukung Anda berkuliah di jurusan yang saat ini Anda jalani?",
-            "Apakah Jurusan yang Anda pilih sudah sesuai dengan keinginan diri sendiri?",
-            "Apakah Anda mendapatkan dukungan finansial penuh dari keluarga untuk keperluan kuliah?",
-            "Apakah Anda memiliki keterbatasan fisik?",
-            "Apakah Anda memiliki akses yang baik terhadap layanan kesehatan?",
-            "Apakah anda memiliki jaminan kesehatan?",
-            "Apakah Anda suka berolahraga?",
-            "Apakah Anda memiliki kegiatan di luar kuliah yang mempengaruhi waktu belajar Anda?"
-        ], errors='ignore')
-
-        # FINAL CHECK: Cek apakah semua faktor ada di data_master (untuk Regresi/Korelasi)
-        all_required_cols = [col for group in FAKTOR_GROUPS.values() for col in group]
-        missing_cols = [col for col in all_required_cols if col not in data_master.columns]
-        
-        if missing_cols:
-             st.warning(f"Warning: Kolom Survei berikut tidak ditemukan di data_master: {', '.join(set(missing_cols))}. Regresi/Korelasi mungkin gagal untuk faktor-faktor ini.")
-
-        return df, df1, data_master
-    
+        info["baris"] = len(data_master)
+
+    # FINAL CHECK: Cek apakah semua faktor ada di data_master (untuk Regresi/Korelasi)
+    all_required_cols = [col for group in FAKTOR_GROUPS.values() for col in group]
+    missing_cols = [col for col in all_required_cols if col not in data_master.columns]
+
+    if missing_cols:
+        peringatan.append(f"Warning: Kolom Survei berikut tidak ditemukan di data_master: {', '.join(set(missing_cols))}. Regresi/Korelasi mungkin gagal untuk faktor-faktor ini.")
+
+    # --- LANGKAH 4: TATA LETAK MEMORI RINGKAS ---
+    with profil_tahap("load_data/padatkan_memori"):
+        sebelum = {"df": df, "df1": df1, "data_master": data_master}
+        df = padatkan_transkrip(df, urutan)
+        df1 = padatkan_mahasiswa(df1, urutan)
+        data_master = padatkan_survei(data_master)
+        laporan_memori = laporan_penghematan_memori(sebelum, {"df": df, "df1": df1, "data_master": data_master})
+
+    return df, df1, data_master, peringatan, laporan_memori
+
+def load_data(uploaded_file):
+    """Memuat data dari file XLSX (atau CSV/Parquet terpisah) dan melakukan preprocessing lengkap.
+
+    Bundel dataset (.zip hasil ekspor) dibaca langsung tanpa preprocessing.
+    """
+    try:
+        if adalah_bundel(uploaded_file):
+            with profil_tahap("load_data/baca_bundel") as info:
+                df, df1, data_master, laporan_memori, _ = baca_bundel(uploaded_file)
+                info["baris"] = len(df)
+            peringatan = []
+        else:
+            df, df1, data_master, peringatan, laporan_memori = proses_data(uploaded_file)
     except Exception as e:
         st.error(f"Terjadi kesalahan saat memuat data. Pastikan nama sheet sudah benar dan format file sesuai.")
         st.error(f"Detail error: {e}")
-        return None, None, None
+        return None, None, None, None
+
+    for pesan in peringatan:
+        st.warning(pesan)
+    return df, df1, data_master, laporan_memori
+
+# --- Cache Dataset Berdasarkan Hash Isi File ---
+class LRUCache:
+    """Cache berbatas ukuran dengan eviksi Least Recently Used (aman dipakai lintas thread)."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+def hash_file(uploaded_file):
+    """Menghasilkan hash SHA-256 dari isi file (atau beberapa file) yang diunggah."""
+    if not isinstance(uploaded_file, list):
+        return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    h = hashlib.sha256()
+    for f in sorted(uploaded_file, key=lambda f: f.name):
+        h.update(f.name.encode())
+        h.update(f.getvalue())
+    return h.hexdigest()
+
+# --- Penambahan Semester Baru (Inkremental) ---
+def baca_transkrip(uploaded_file):
+    """Membaca tabel transkrip saja dari workbook XLSX (sheet transkrip) atau file CSV/Parquet."""
+    nama = os.path.basename(getattr(uploaded_file, "name", "")).lower()
+    if nama.endswith(".csv"):
+        return pd.read_csv(uploaded_file, usecols=_pilih_kolom(KOLOM_TRANSKRIP))
+    if nama.endswith(".parquet"):
+        return _baca_parquet(uploaded_file, KOLOM_TRANSKRIP)
+    with pd.ExcelFile(uploaded_file, engine=EXCEL_ENGINE) as xls:
+        return xls.parse(SHEET_TRANSKRIP, usecols=_pilih_kolom(KOLOM_TRANSKRIP))
+
+def tambah_semester(df, df1, data_master, df_baru):
+    """Menambahkan baris transkrip semester baru ke dataset yang sudah diproses.
+
+    Semester baru harus berada setelah semester terakhir dataset. Hanya mahasiswa yang
+    terpengaruh yang dihitung ulang: mahasiswa di semester baru, serta mahasiswa yang
+    semester terakhirnya adalah semester terakhir lama (status dropout mereka bergantung
+    pada semester berikutnya). Frame masukan tidak diubah. Jawaban survei mahasiswa baru
+    tidak tersedia, sehingga data_master hanya diperbarui IPK/IPS-nya.
+
+    Mengembalikan (df, df1, data_master, peringatan).
+    """
+    tidak_ada = [col for col in KOLOM_TRANSKRIP if col not in df_baru.columns]
+    if tidak_ada:
+        raise ValueError(f"Kolom transkrip berikut tidak ditemukan: {', '.join(tidak_ada)}")
+    df_baru = df_baru[KOLOM_TRANSKRIP].astype({"ANGKATAN": int, "SEMESTER_AMBIL": str})
+    if df_baru.empty:
+        raise ValueError("File semester baru tidak berisi baris transkrip.")
+
+    urutan_lama = urutan_dataset(df)
+    kode_baru = sorted(df_baru["SEMESTER_AMBIL"].unique())
+    salah = [k for k in kode_baru if not re.fullmatch(POLA_KODE_SEMESTER, k) or (urutan_lama and k <= urutan_lama[-1])]
+    if salah:
+        raise ValueError(
+            f"Kode semester {', '.join(salah)} tidak valid atau tidak berada setelah semester terakhir "
+            f"({urutan_lama[-1] if urutan_lama else '-'}). Unggah ulang workbook lengkap untuk memperbaiki data lama."
+        )
+    jumlah_baris = pd.concat([
+        df["SEMESTER_AMBIL"].value_counts(), df_baru["SEMESTER_AMBIL"].value_counts()
+    ])
+    _, terpencil, kosong = saring_semester_terpencil(jumlah_baris)
+    terpencil = [k for k in terpencil if k in kode_baru]
+    if terpencil:
+        raise ValueError(
+            f"Kode semester {', '.join(terpencil)} terpisah jauh dari semester terakhir ({urutan_lama[-1]}) "
+            "dan hanya mencakup sedikit baris (kemungkinan salah ketik). Periksa kembali file semester baru."
+        )
+    urutan = urutan_semester_dari_data(urutan_lama + kode_baru)
+    if len(urutan) > MAKS_SEMESTER_MASK:
+        raise ValueError(
+            f"Menambahkan semester {', '.join(kode_baru)} membuat urutan semester menjadi {len(urutan)} semester "
+            f"({urutan[0]} - {urutan[-1]}), melebihi batas {MAKS_SEMESTER_MASK} semester per dataset."
+        )
+
+    # 1. Transkrip: tambahkan baris baru dengan kategori semester dan NIM yang diperluas
+    baru = padatkan_transkrip(df_baru, urutan)
+    kategori = pd.CategoricalDtype(list(urutan) + [k for k in df["SEMESTER_AMBIL"].cat.categories if k not in urutan], ordered=True)
+    nim = pd.api.types.union_categoricals([df["NIM"].array, baru["NIM"].array])
+    df = pd.concat([
+        df.drop(columns="NIM").assign(SEMESTER_AMBIL=df["SEMESTER_AMBIL"].astype(kategori)),
+        baru.drop(columns="NIM").assign(SEMESTER_AMBIL=baru["SEMESTER_AMBIL"].astype(kategori)),
+    ], ignore_index=True)
+    df.insert(0, "NIM", nim)
+    df = df[KOLOM_TRANSKRIP]
+
+    # 2. Mahasiswa: ringkasan semester baru digabung dengan ringkasan lama per NIM
+    lama = df1.set_index("NIM")
+    tambahan = ringkas_mahasiswa(df_baru, urutan)
+    sudah_ada = tambahan.index.isin(lama.index)
+    tambahan_lama, mahasiswa_baru = tambahan[sudah_ada], tambahan[~sudah_ada]
+    sebelum = lama.loc[tambahan_lama.index]
+    diperbarui = pd.DataFrame({
+        "ANGKATAN": sebelum["ANGKATAN"],
+        # Sama seperti agregasi 'last': nilai kosong di semester baru tidak menimpa nilai lama
+        "IPS": tambahan_lama["IPS"].fillna(sebelum["IPS"]),
+        "IPK": tambahan_lama["IPK"].fillna(sebelum["IPK"]),
+        "TOTAL_SKS": sebelum["TOTAL_SKS"] + tambahan_lama["TOTAL_SKS"],
+        "SEMESTER_TERAKHIR": tambahan_lama["SEMESTER_TERAKHIR"],
+        "TOTAL_SEMESTER": sebelum["TOTAL_SEMESTER"] + tambahan_lama["TOTAL_SEMESTER"],
+        "SEMESTER_MASK": sebelum["SEMESTER_MASK"].astype(np.int64) | tambahan_lama["SEMESTER_MASK"],
+        "IDX_TERAKHIR": tambahan_lama["IDX_TERAKHIR"],
+    })
+    # Mahasiswa yang berhenti tepat di semester terakhir lama kini punya semester berikutnya
+    berhenti = lama[(lama["SEMESTER_TERAKHIR"].astype(str) == urutan_lama[-1]) & ~lama.index.isin(tambahan.index)] if urutan_lama else lama.iloc[:0]
+    berhenti = berhenti.assign(IDX_TERAKHIR=len(urutan_lama) - 1)
+
+    ubah = pd.concat([diperbarui, mahasiswa_baru, berhenti[diperbarui.columns]])
+    ubah["LAMA_KULIAH_TAHUN"] = ubah["TOTAL_SEMESTER"] / 2
+    ubah["KELULUSAN_STATUS"] = tentukan_status(ubah["TOTAL_SEMESTER"], ubah["IDX_TERAKHIR"], ubah["SEMESTER_MASK"], len(urutan))
+
+    tetap = lama.drop(index=ubah.index, errors="ignore")
+    df1 = pd.concat([
+        tetap.astype({"SEMESTER_TERAKHIR": str, "KELULUSAN_STATUS": str}),
+        ubah.drop(columns="IDX_TERAKHIR").astype({"SEMESTER_TERAKHIR": str}),
+    ]).sort_index().rename_axis("NIM").reset_index()[KOLOM_MAHASISWA]
+    df1 = padatkan_mahasiswa(df1, urutan)
+
+    # 3. data_master: perbarui IPK/IPS responden yang terpengaruh
+    terpengaruh = data_master["NIM"].isin(tambahan.index)
+    if terpengaruh.any():
+        nilai = df1.set_index("NIM")
+        data_master = data_master.copy()
+        for col in ["IPK", "IPS"]:
+            data_master.loc[terpengaruh, col] = data_master.loc[terpengaruh, "NIM"].map(nilai[col]).to_numpy()
+
+    peringatan = []
+    kosong = [k for k in kosong if urutan_lama and k > urutan_lama[-1]]
+    if kosong:
+        peringatan.append(
+            f"Semester {', '.join(kosong)} tidak memiliki baris transkrip tetapi berada sebelum semester baru, "
+            "sehingga mahasiswa yang tidak mengambilnya dapat terhitung Dropout/Non-aktif."
+        )
+    if len(mahasiswa_baru):
+        peringatan.append(
+            f"{len(mahasiswa_baru)} mahasiswa baru belum tercakup data survei dataset ini sehingga tidak masuk analisis "
+            "korelasi/regresi. Unggah ulang workbook lengkap untuk menyertakan jawaban survei mereka."
+        )
+    return df, df1, data_master, peringatan
+
+# --- Registri Dataset Bersama Lintas Sesi ---
+def ukuran_dataset(hasil):
+    """Ukuran memori (byte, deep) seluruh frame pada hasil load_data."""
+    return sum(int(frame.memory_usage(deep=True).sum()) for frame in hasil if isinstance(frame, pd.DataFrame))
+
+class RegistriDataset:
+    """Registri dataset hasil preprocessing yang dipakai bersama seluruh sesi dalam satu proses.
+
+    Dataset dikunci dengan hash isi file dan hanya diproses sekali meskipun beberapa sesi
+    mengunggah file yang sama secara bersamaan. Setiap sesi yang memakai dataset memegang
+    satu referensi; bila total memori melebihi anggaran, dataset yang paling lama tidak
+    dipakai dan tidak lagi direferensikan sesi mana pun dikeluarkan. Frame yang dibagikan
+    bersifat read-only: sesi tidak boleh mengubahnya di tempat.
+    """
+
+    def __init__(self, batas_byte):
+        self.batas_byte = batas_byte
+        self._data = OrderedDict()  # kunci -> {"hasil", "ukuran", "ref"}
+        self._pemuat = {}  # kunci -> Lock yang dipegang sesi yang sedang memproses
+        self._lock = threading.Lock()
+
+    def ambil(self, kunci, muat):
+        """Mengembalikan (hasil, dari_registri) dan menambah satu referensi bila berhasil.
+
+        muat() hanya dipanggil jika kunci belum ada; sesi lain yang meminta kunci yang sama
+        menunggu hasilnya. Hasil gagal (frame None) tidak disimpan dan tidak direferensikan.
+        """
+        while True:
+            with self._lock:
+                entri = self._data.get(kunci)
+                if entri is not None:
+                    entri["ref"] += 1
+                    self._data.move_to_end(kunci)
+                    return entri["hasil"], True
+                kunci_lock = self._pemuat.get(kunci)
+                pemilik = kunci_lock is None
+                if pemilik:
+                    kunci_lock = self._pemuat[kunci] = threading.Lock()
+                    kunci_lock.acquire()
+
+            if pemilik:
+                break
+            # Tunggu sesi lain selesai memproses, lalu periksa registri lagi
+            with kunci_lock:
+                pass
+
+        hasil = None
+        try:
+            hasil = muat()
+            ukuran = ukuran_dataset(hasil) if hasil[0] is not None else 0
+        finally:
+            with self._lock:
+                del self._pemuat[kunci]
+                if hasil is not None and hasil[0] is not None:
+                    self._data[kunci] = {"hasil": hasil, "ukuran": ukuran, "ref": 1}
+                    self._keluarkan()
+            kunci_lock.release()
+        return hasil, False
+
+    def lepas(self, kunci):
+        """Melepas satu referensi sesi atas dataset kunci."""
+        with self._lock:
+            entri = self._data.get(kunci)
+            if entri is not None:
+                entri["ref"] = max(0, entri["ref"] - 1)
+                self._keluarkan()
+
+    def _keluarkan(self):
+        # Dipanggil dengan self._lock dipegang; dataset yang masih dipakai tidak pernah dikeluarkan
+        total = sum(entri["ukuran"] for entri in self._data.values())
+        for kunci in list(self._data):
+            if total <= self.batas_byte:
+                break
+            if self._data[kunci]["ref"] == 0:
+                total -= self._data.pop(kunci)["ukuran"]
+
+    def status(self):
+        """Ringkasan isi registri: jumlah dataset, total memori (MB), dan jumlah referensi sesi."""
+        with self._lock:
+            return {
+                "dataset": len(self._data),
+                "memori_mb": sum(entri["ukuran"] for entri in self._data.values()) / 2**20,
+                "batas_mb": self.batas_byte / 2**20,
+                "referensi": sum(entri["ref"] for entri in self._data.values()),
+            }
+
+class PeganganDataset:
+    """Referensi satu sesi atas dataset di registri; dilepas otomatis saat sesi berakhir.
+
+    kunci_sumber adalah hash file di uploader; kunci berbeda darinya bila dataset sudah
+    ditambah semester baru.
+    """
+
+    def __init__(self, registri, kunci, hasil, kunci_sumber):
+        self.kunci = kunci
+        self.kunci_sumber = kunci_sumber
+        self.hasil = hasil
+        self._lepas = weakref.finalize(self, registri.lepas, kunci)
+
+    def lepas(self):
+        self._lepas()
+
+@st.cache_resource
+def registri_dataset():
+    """Registri dataset tunggal untuk seluruh sesi di proses server ini."""
+    return RegistriDataset(BATAS_MEMORI_REGISTRI_MB * 2**20)
+
+def lepas_dataset_sesi():
+    """Melepas dataset yang sedang dipegang sesi ini (mis. saat file dihapus dari uploader)."""
+    pegangan = st.session_state.pop("pegangan_dataset", None)
+    if pegangan is not None:
+        pegangan.lepas()
+
+def load_data_cached(uploaded_file):
+    """Memuat data melalui registri bersama; file dengan isi sama tidak diparsing ulang oleh sesi mana pun."""
+    # Bundel juga dikunci dengan hash isinya sendiri: hash_sumber di manifest tidak dapat
+    # diverifikasi, sehingga tidak boleh menentukan entri registri yang dipakai sesi lain
+    kunci = hash_file(uploaded_file)
+    pegangan = st.session_state.get("pegangan_dataset")
+    if pegangan is not None and pegangan.kunci_sumber == kunci:
+        return (*pegangan.hasil, pegangan.kunci, True)
+
+    registri = registri_dataset()
+    hasil, dari_registri = registri.ambil(kunci, lambda: load_data(uploaded_file))
+    if hasil[0] is not None:
+        lepas_dataset_sesi()
+        st.session_state["pegangan_dataset"] = PeganganDataset(registri, kunci, hasil, kunci_sumber=kunci)
+    return (*hasil, kunci, dari_registri)
+
+def tambah_semester_sesi(file_semester):
+    """Menambahkan semester baru ke dataset sesi ini; hasilnya disimpan di registri bersama.
+
+    Mengembalikan (df, df1, data_master, laporan_memori, kunci_data, peringatan).
+    """
+    pegangan = st.session_state["pegangan_dataset"]
+    kunci = hashlib.sha256((pegangan.kunci + hash_file(file_semester)).encode()).hexdigest()
+    peringatan = []
+
+    def muat():
+        df, df1, data_master, laporan_memori = pegangan.hasil
+        lama = {"df": df, "df1": df1, "data_master": data_master}
+        df, df1, data_master, pesan = tambah_semester(df, df1, data_master, baca_transkrip(file_semester))
+        peringatan.extend(pesan)
+        laporan_memori = perbarui_laporan_memori(laporan_memori, lama, {"df": df, "df1": df1, "data_master": data_master})
+        return df, df1, data_master, laporan_memori
+
+    registri = registri_dataset()
+    hasil, _ = registri.ambil(kunci, muat)
+    kunci_sumber = pegangan.kunci_sumber
+    lepas_dataset_sesi()
+    st.session_state["pegangan_dataset"] = PeganganDataset(registri, kunci, hasil, kunci_sumber=kunci_sumber)
+    return (*hasil, kunci, peringatan)
+
+# --- Kubus Agregat untuk Visualisasi Deskriptif ---
+def kategori_semester(semester, urutan):
+    """Mengubah kode semester menjadi Categorical berurutan sesuai urutan (kode lain di akhir)."""
+    semester = semester.astype(str)
+    lain = sorted(set(semester.unique()) - set(urutan))
+    return pd.Categorical(semester, categories=list(urutan) + lain, ordered=True)
+
+def bangun_kubus(df, df1):
+    """Membangun kubus agregat berindeks (ANGKATAN, SEMESTER_AMBIL, KELULUSAN_STATUS).
+
+    Metrik per baris transkrip (JUMLAH_BARIS, IPS_SUM, IPS_N) dihitung pada semester yang
+    diambil, sedangkan metrik per mahasiswa (JUMLAH_MAHASISWA, IPK_SUM, IPK_N) dicatat pada
+    SEMESTER_TERAKHIR sehingga setiap mahasiswa terhitung tepat satu kali. Ringkasan per
+    angkatan, tren IPS, dan status kelulusan diturunkan dari kubus ini, sehingga filter di
+    Tab 1 cukup memotong tabel kecil tanpa groupby ulang atas data transkrip.
+    """
+    kunci = ["ANGKATAN", "SEMESTER_AMBIL", "KELULUSAN_STATUS"]
+    status = df1.set_index("NIM")["KELULUSAN_STATUS"]
+    urutan = urutan_dataset(df)
+
+    baris = df[["NIM", "ANGKATAN", "SEMESTER_AMBIL", "IPS"]].assign(
+        SEMESTER_AMBIL=kategori_semester(df["SEMESTER_AMBIL"], urutan),
+        KELULUSAN_STATUS=df["NIM"].map(status)
+    )
+    per_baris = baris.groupby(kunci, observed=True).agg(
+        JUMLAH_BARIS=("NIM", "size"), IPS_SUM=("IPS", "sum"), IPS_N=("IPS", "count")
+    )
+
+    mahasiswa = df1[["NIM", "ANGKATAN", "IPK", "KELULUSAN_STATUS"]].assign(
+        SEMESTER_AMBIL=kategori_semester(df1["SEMESTER_TERAKHIR"], urutan)
+    )
+    per_mahasiswa = mahasiswa.groupby(kunci, observed=True).agg(
+        JUMLAH_MAHASISWA=("NIM", "size"), IPK_SUM=("IPK", "sum"), IPK_N=("IPK", "count")
+    )
+
+    kubus = per_baris.join(per_mahasiswa, how="outer").fillna(0).sort_index()
+
+    # Ringkasan turunan yang langsung dipakai oleh grafik
+    angkatan = kubus.groupby(level="ANGKATAN")[["JUMLAH_MAHASISWA", "IPK_SUM", "IPK_N"]].sum()
+    angkatan["JUMLAH_MAHASISWA"] = angkatan["JUMLAH_MAHASISWA"].astype(int)
+    angkatan["IPK"] = angkatan["IPK_SUM"] / angkatan["IPK_N"].replace(0, np.nan)
+
+    ips = kubus.groupby(level=["ANGKATAN", "SEMESTER_AMBIL"], observed=True)[["IPS_SUM", "IPS_N"]].sum()
+    ips = ips[ips["IPS_N"] > 0]
+    ips["IPS"] = ips["IPS_SUM"] / ips["IPS_N"]
+
+    status_angkatan = kubus.groupby(level=["ANGKATAN", "KELULUSAN_STATUS"], observed=True)["JUMLAH_MAHASISWA"].sum().astype(int)
+    status_angkatan = status_angkatan[status_angkatan > 0]
+    status_angkatan = status_angkatan.sort_values(ascending=False, kind="stable").sort_index(level="ANGKATAN", sort_remaining=False)
+
+    return {"kubus": kubus, "angkatan": angkatan, "ips": ips, "status": status_angkatan}
+
+@st.cache_resource(max_entries=MAKS_CACHE_DATASET, show_spinner=False)
+def kubus_agregat(kunci_data, _df, _df1):
+    """Kubus agregat Tab 1, dibangun sekali per dataset (kunci_data)."""
+    return bangun_kubus(_df, _df1)
+
+# --- Retensi Kohort ---
+# Keadaan mahasiswa pada setiap semester sejak masuk. Setelah semester terakhirnya, mahasiswa
+# berstatus lulus (termasuk Tidak Lulus Tepat Waktu, yaitu lulus lebih dari 8 semester) atau dropout.
+KEADAAN_RETENSI = ["Terdaftar", "Jeda (Cuti)", "Lulus", "Dropout/Non-aktif"]
+STATUS_LULUS = ["Lulus Lebih Awal", "Lulus Tepat Waktu", "Tidak Lulus Tepat Waktu"]
+
+def hitung_retensi_kohort(df1, urutan):
+    """Proporsi keadaan setiap angkatan per semester sejak masuk, dari matriks mahasiswa x semester.
+
+    Matriks keikutsertaan dibentuk sekali dari SEMESTER_MASK; seluruh mahasiswa dan semester
+    diklasifikasikan sekaligus: Terdaftar (semester diambil), Jeda (tidak diambil tetapi ada
+    semester yang diambil sesudahnya), lalu Lulus atau Dropout/Non-aktif setelah semester
+    terakhir sesuai KELULUSAN_STATUS. Semester yang melewati akhir data tidak dihitung (tersensor),
+    sehingga penyebut proporsi adalah mahasiswa yang sudah teramati pada semester tersebut.
+    Mengembalikan DataFrame (ANGKATAN, SEMESTER_KE, KEADAAN, JUMLAH, PROPORSI).
+    """
+    jumlah_semester = len(urutan)
+    if jumlah_semester == 0:
+        return pd.DataFrame(columns=["ANGKATAN", "SEMESTER_KE", "KEADAAN", "JUMLAH", "PROPORSI"])
+    periksa_batas_semester(urutan)
+    mask = df1["SEMESTER_MASK"].to_numpy(dtype=np.int64)
+    ada = mask != 0
+    mask = mask[ada]
+    angkatan, kohort = np.unique(df1["ANGKATAN"].to_numpy()[ada], return_inverse=True)
+    lulus = df1["KELULUSAN_STATUS"].isin(STATUS_LULUS).to_numpy()[ada]
+
+    # Matriks keikutsertaan: baris = mahasiswa, kolom = posisi semester di urutan
+    semester = np.arange(jumlah_semester)
+    terdaftar = (np.right_shift(mask[:, None], semester) & 1).astype(bool)
+    idx_awal = terdaftar.argmax(axis=1)
+    idx_akhir = jumlah_semester - 1 - terdaftar[:, ::-1].argmax(axis=1)
+
+    # Geser setiap baris ke semester sejak masuk (kolom 0 = semester masuk)
+    posisi = idx_awal[:, None] + semester
+    teramati = posisi < jumlah_semester
+    ambil = np.take_along_axis(terdaftar, np.minimum(posisi, jumlah_semester - 1), axis=1)
+    setelah_akhir = posisi > idx_akhir[:, None]
+    keadaan = np.select(
+        [ambil, ~setelah_akhir, lulus[:, None]],
+        [0, 1, 2],
+        default=3,
+    )
+
+    # Satu bincount untuk seluruh (angkatan, semester ke-, keadaan)
+    n_keadaan = len(KEADAAN_RETENSI)
+    kunci = (kohort[:, None] * jumlah_semester + semester) * n_keadaan + keadaan
+    jumlah = np.bincount(kunci[teramati], minlength=len(angkatan) * jumlah_semester * n_keadaan)
+    jumlah = jumlah.reshape(len(angkatan), jumlah_semester, n_keadaan)
+    total = jumlah.sum(axis=2, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        proporsi = jumlah / total
+
+    indeks = pd.MultiIndex.from_product(
+        [angkatan, semester + 1, KEADAAN_RETENSI], names=["ANGKATAN", "SEMESTER_KE", "KEADAAN"]
+    )
+    hasil = pd.DataFrame({"JUMLAH": jumlah.ravel(), "PROPORSI": proporsi.ravel()}, index=indeks)
+    # Semester ke- yang belum teramati untuk suatu angkatan dibuang
+    return hasil[np.repeat(total.ravel() > 0, n_keadaan)].reset_index()
+
+@st.cache_resource(max_entries=MAKS_CACHE_DATASET, show_spinner=False)
+def retensi_kohort(kunci_data, _df, _df1):
+    """Tabel retensi kohort, dibangun sekali per dataset (kunci_data)."""
+    return hitung_retensi_kohort(_df1, urutan_dataset(_df))
+
+# --- Indeks dan Detail per Mahasiswa ---
+def _posisi_per_nim(nim, kolom_nim, kunci_urut=None):
+    """Posisi baris per NIM dalam bentuk CSR: baris[awal[i]:awal[i + 1]] milik mahasiswa nim[i].
+
+    Baris yang NIM-nya tidak ada di `nim` diabaikan; kunci_urut (opsional) mengurutkan baris
+    di dalam setiap mahasiswa.
+    """
+    if isinstance(kolom_nim.dtype, pd.CategoricalDtype):
+        # Cukup mencocokkan kategori sekali, lalu dipetakan lewat kode (tanpa hashing per baris)
+        peta = np.append(nim.get_indexer(kolom_nim.cat.categories), -1)
+        pos = peta[kolom_nim.cat.codes.to_numpy()]
+    else:
+        pos = nim.get_indexer(kolom_nim)
+    urut = np.lexsort((kunci_urut, pos)) if kunci_urut is not None else np.argsort(pos, kind="stable")
+    urut = urut[pos[urut] >= 0]
+    awal = np.searchsorted(pos[urut], np.arange(len(nim) + 1))
+    return urut.astype(np.int32), awal.astype(np.int32)
+
+def bangun_indeks_mahasiswa(df, df1, data_master):
+    """Indeks NIM -> posisi baris di df1, transkrip (df), dan survei (data_master).
+
+    Baris df1 mahasiswa ke-i adalah posisi i pada indeks NIM; baris transkripnya sudah
+    urut semester. Pencarian satu NIM hanya berupa lookup indeks dan potongan array,
+    sehingga tetap instan berapa pun jumlah mahasiswanya.
+    """
+    nim = pd.Index(df1["NIM"])
+    if not nim.is_unique:
+        raise ValueError("NIM pada tabel mahasiswa tidak unik.")
+    semester = df["SEMESTER_AMBIL"]
+    kode_semester = semester.cat.codes.to_numpy() if isinstance(semester.dtype, pd.CategoricalDtype) else urutan_semester(semester, urutan_dataset(df))
+    return {
+        "nim": nim,
+        "urutan": urutan_dataset(df),
+        "transkrip": _posisi_per_nim(nim, df["NIM"], kode_semester),
+        "survei": _posisi_per_nim(nim, data_master["NIM"]),
+    }
+
+@st.cache_resource(max_entries=MAKS_CACHE_DATASET, show_spinner=False)
+def indeks_mahasiswa(kunci_data, _df, _df1, _data_master):
+    """Indeks per mahasiswa, dibangun sekali per dataset (kunci_data)."""
+    return bangun_indeks_mahasiswa(_df, _df1, _data_master)
+
+def detail_mahasiswa(indeks, df, df1, data_master, nim):
+    """Data drill-down satu mahasiswa dari indeks; None jika NIM tidak ditemukan.
+
+    Mengembalikan {"profil": baris df1, "timeline": IPS/IPK/SKS per semester dari semester
+    pertama hingga terakhir yang diambil (semester yang tidak diambil bernilai kosong),
+    "survei": jawaban survei per pertanyaan (satu kolom per respons)}.
+    """
+    if nim not in indeks["nim"]:
+        return None
+    i = indeks["nim"].get_loc(nim)
+
+    urut, awal = indeks["transkrip"]
+    transkrip = df.iloc[urut[awal[i]:awal[i + 1]]]
+    semester = transkrip["SEMESTER_AMBIL"].astype(str).to_numpy()
+    urutan = indeks["urutan"]
+    diambil = semester_dari_mask(df1["SEMESTER_MASK"].iat[i], urutan)
+    rentang = urutan[urutan.index(diambil[0]):urutan.index(diambil[-1]) + 1] if diambil else []
+    timeline = (
+        transkrip[["IPS", "IPK", "SKS"]].set_axis(semester).groupby(level=0, sort=False).last()
+        .reindex(list(dict.fromkeys(rentang + list(semester))))
+        .rename_axis("SEMESTER")
+    )
+    timeline.insert(0, "DIAMBIL", timeline.index.isin(semester))
+
+    urut, awal = indeks["survei"]
+    respons = data_master.iloc[urut[awal[i]:awal[i + 1]]]
+    nilai_respons = respons.to_dict("list")
+    jawaban = {}
+    for pertanyaan, (kolom, encoding) in SKEMA_SURVEI.items():
+        # Kode jawaban dikembalikan ke teks aslinya; skala Likert ditampilkan sebagai teks angka
+        label = {kode: teks for teks, kode in encoding.items()} if encoding else {}
+        jawaban[pertanyaan] = [
+            None if pd.isna(nilai) else str(label.get(nilai, nilai))
+            for nilai in nilai_respons.get(kolom, [None] * len(respons))
+        ]
+    kolom_jawaban = [f"Jawaban {n + 1}" for n in range(len(respons))] if len(respons) > 1 else ["Jawaban"]
+    survei = pd.DataFrame.from_dict(jawaban, orient="index", columns=kolom_jawaban[:len(respons)]).rename_axis("Pertanyaan")
+    return {"profil": df1.iloc[i], "timeline": timeline, "survei": survei}
+
+# --- Fungsi Grafik Visualisasi Deskriptif ---
+@st.cache_resource
+def cache_grafik():
+    """Cache gambar grafik (PNG) tingkat proses, dipakai bersama oleh seluruh sesi."""
+    return LRUCache(MAKS_CACHE_GRAFIK)
+
+# pyplot menyimpan daftar figure secara global dan tidak thread-safe; seluruh sesi membuat
+# grafik lewat render_grafik di bawah kunci ini
+_KUNCI_PYPLOT = threading.Lock()
+
+def render_grafik(kunci, buat_grafik):
+    """Mengembalikan PNG grafik untuk `kunci` (hash dataset, id grafik, nilai filter).
+
+    Jika belum ada di cache, figure dibuat dengan `buat_grafik`, dirender ke PNG, lalu
+    langsung ditutup agar figure matplotlib tidak menumpuk di memori server. Figure yang
+    sudah dibuat tetap ditutup bila `buat_grafik` atau rendering gagal di tengah jalan.
+    """
+    cache = cache_grafik()
+    png = cache.get(kunci)
+    if png is None:
+        import matplotlib.pyplot as plt
+
+        with _KUNCI_PYPLOT:
+            sebelum = set(plt.get_fignums())
+            try:
+                fig = buat_grafik()
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+                png = buffer.getvalue()
+            finally:
+                for nomor in set(plt.get_fignums()) - sebelum:
+                    plt.close(nomor)
+        cache.put(kunci, png)
+    return png
+
+def grafik_distribusi_angkatan(df_angkatan_count):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.barplot(x='ANGKATAN', y='JUMLAH_MAHASISWA', hue='ANGKATAN', data=df_angkatan_count, palette='Spectral', legend=False, ax=ax)
+    for container in ax.containers:
+        ax.bar_label(container, fmt='%d', color='black', fontsize=10, padding=3)
+
+    ax.set_title('Distribusi Jumlah Mahasiswa')
+    ax.set_xlabel('Angkatan Masuk')
+    ax.set_ylabel('Jumlah Mahasiswa')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    return fig
+
+def grafik_ipk_angkatan(avg_ipk_by_angkatan):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    sns.barplot(x='ANGKATAN', y='IPK', hue='ANGKATAN', data=avg_ipk_by_angkatan, palette='viridis', legend=False, ax=ax)
+    for container in ax.containers:
+        ax.bar_label(container, fmt='%.2f', color='black', padding=1)
+
+    ax.set_title('Rata-rata IPK Mahasiswa per Angkatan')
+    ax.set_xlabel('Angkatan')
+    ax.set_ylabel('Rata-rata IPK')
+    ax.set_ylim(min(2.5, avg_ipk_by_angkatan['IPK'].min()), 4.0)
+    ax.grid(axis='y', linestyle='--')
+    return fig
+
+def grafik_tren_ips(avg_ips_by_semester, selected_angkatan_tren):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+
+    # Gunakan hue='ANGKATAN' agar setiap angkatan memiliki garis warna berbeda
+    sns.lineplot(
+        x='SEMESTER_AMBIL', 
+        y='IPS', 
+        hue='ANGKATAN', 
+        data=avg_ips_by_semester, 
+        marker='o', 
+        ax=ax,
+        palette=sns.color_palette("tab10", n_colors=len(selected_angkatan_tren))
+    )
+    ax.set_title(f'Tren Rata-Rata IPS (Angkatan: {", ".join(map(str, selected_angkatan_tren))})')
+    ax.set_xlabel('Semester Akademik')
+    ax.set_ylabel('Rata-Rata IPS')
+    ax.legend(title='Angkatan')
+    ax.grid(True)
+    return fig
+
+def grafik_status_kelulusan(status_counts, selected_angkatan_kelulusan):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(3, 3))
+    ax.pie(
+        status_counts, 
+        labels=status_counts.index, 
+        autopct='%1.1f%%',
+        startangle=140, 
+        colors=sns.color_palette("Set2"),
+        wedgeprops={'edgecolor': 'black'}
+    )
+    ax.set_title(f'Proporsi Status Mahasiswa Angkatan {selected_angkatan_kelulusan}')
+    ax.axis('equal')
+    return fig
+
+def grafik_retensi_kohort(retensi):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Masih studi = terdaftar atau sedang jeda; lulus dan dropout bersifat kumulatif
+    proporsi = retensi.pivot_table(index=["ANGKATAN", "SEMESTER_KE"], columns="KEADAAN", values="PROPORSI", observed=True)
+    kurva = {
+        "Masih Studi (Terdaftar + Jeda)": proporsi[["Terdaftar", "Jeda (Cuti)"]].sum(axis=1),
+        "Lulus": proporsi["Lulus"],
+        "Dropout/Non-aktif": proporsi["Dropout/Non-aktif"],
+    }
+    angkatan = proporsi.index.get_level_values("ANGKATAN").unique()
+    warna = dict(zip(angkatan, sns.color_palette("tab10", n_colors=len(angkatan))))
+
+    fig, axes = plt.subplots(1, 3, figsize=(15, 4), sharex=True, sharey=True)
+    for ax, (judul, nilai) in zip(axes, kurva.items()):
+        for tahun, seri in nilai.groupby(level="ANGKATAN"):
+            ax.plot(seri.index.get_level_values("SEMESTER_KE"), seri.to_numpy(), marker='o', label=str(tahun), color=warna[tahun])
+        ax.set_title(judul)
+        ax.set_xlabel('Semester ke- (sejak masuk)')
+        ax.set_ylim(0, 1.05)
+        ax.grid(True, linestyle='--', alpha=0.7)
+    axes[0].set_ylabel('Proporsi Mahasiswa Angkatan')
+    axes[-1].legend(title='Angkatan', bbox_to_anchor=(1.02, 1), loc='upper left')
+    return fig
 
 # --- Fungsi Uji Korelasi Spearman ---
-# (Biarkan fungsi ini sama, karena list faktor sudah diperbaiki di FAKTOR_GROUPS global)
-def run_spearman_correlation(data, factor_list, factor_name):
-    # ... (Kode run_spearman_correlation tetap sama, tapi menggunakan r-string) ...
-    st.subheader(f"Tabel Hasil Uji Korelasi Spearman: {factor_name}")
-    
+def hitung_spearman_batch(data, factor_list, target="IPK"):
+    """Menghitung rho dan p-value Spearman seluruh faktor terhadap target dalam satu langkah vektor.
+
+    NaN ditangani secara pairwise-complete: setiap faktor hanya memakai baris yang faktor
+    dan targetnya terisi, sehingga hasilnya sama dengan spearmanr pada data[[faktor, target]].dropna().
+    Mengembalikan DataFrame berindeks faktor dengan kolom rho, p_value, dan n.
+    """
+    from scipy.special import stdtr  # t.sf(x, dof) = stdtr(dof, -x); jauh lebih ringan dari scipy.stats
+
+    faktor = [f for f in dict.fromkeys(factor_list) if f in data.columns]
+    X = data[faktor].astype(float)
+    y = data[target].astype(float).to_numpy()
+
+    valid = X.notna() & ~np.isnan(y)[:, None]
+    Y = pd.DataFrame(np.broadcast_to(y[:, None], X.shape), index=X.index, columns=faktor)
+
+    # Ranking per kolom hanya pada baris valid (ties diberi rank rata-rata seperti spearmanr)
+    rank_x = X.where(valid).rank().to_numpy()
+    rank_y = Y.where(valid).rank().to_numpy()
+    n = valid.sum().to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx = np.nan_to_num(rank_x - np.nanmean(rank_x, axis=0))
+        dy = np.nan_to_num(rank_y - np.nanmean(rank_y, axis=0))
+        rho = (dx * dy).sum(axis=0) / np.sqrt((dx ** 2).sum(axis=0) * (dy ** 2).sum(axis=0))
+
+        # Uji signifikansi dengan distribusi t (dof = n - 2), sama seperti spearmanr
+        dof = n - 2
+        t_stat = rho * np.sqrt(dof / ((rho + 1.0) * (1.0 - rho)))
+        p_value = 2 * stdtr(dof, -np.abs(t_stat))
+
+    return pd.DataFrame({"rho": rho, "p_value": p_value, "n": n}, index=faktor)
+
+@st.cache_data(max_entries=MAKS_CACHE_DATASET, show_spinner=False)
+def spearman_semua_faktor(kunci_data, _data):
+    """Tabel Spearman seluruh faktor di FAKTOR_GROUPS, dihitung sekali per dataset (kunci_data)."""
+    return hitung_spearman_batch(_data, [col for group in FAKTOR_GROUPS.values() for col in group])
+
+def _rank_berbobot(kode, bobot, jumlah_kode):
+    """Rank rata-rata (ties seperti spearmanr) untuk setiap baris matriks bobot.
+
+    Kolom ke-k mewakili bobot[:, k] pengamatan bernilai kode[k] (indeks nilai unik terurut,
+    0..jumlah_kode-1). Rank dihitung dari jumlah bobot per kode, tanpa sorting.
+    """
+    baris = bobot.shape[0]
+    offset = np.arange(baris)[:, None] * jumlah_kode
+    jumlah = np.bincount((offset + kode).ravel(), weights=bobot.ravel(), minlength=baris * jumlah_kode)
+    jumlah = jumlah.reshape(baris, jumlah_kode)
+    rank_kode = np.cumsum(jumlah, axis=1) - (jumlah - 1) / 2.0
+    return rank_kode[:, kode]
+
+def _korelasi_berbobot(a, b, bobot):
+    """Korelasi Pearson berbobot per baris antara dua matriks berukuran sama."""
+    total = bobot.sum(axis=1, keepdims=True)
+    a = a - (bobot * a).sum(axis=1, keepdims=True) / total
+    b = b - (bobot * b).sum(axis=1, keepdims=True) / total
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (bobot * a * b).sum(axis=1) / np.sqrt((bobot * a ** 2).sum(axis=1) * (bobot * b ** 2).sum(axis=1))
+
+def _permutasi_per_level(zx, zy, jumlah_x, jumlah_y, jumlah, rng):
+    """rho permutasi lewat tabel kontingensi acak (hipergeometrik berurutan per level).
+
+    Mengacak pasangan sama dengan membagi multiset nilai y secara acak ke kelompok-kelompok
+    nilai x; biayanya sebanding dengan jumlah level x * level y, bukan jumlah responden.
+    """
+    sisa = np.broadcast_to(jumlah_y, (jumlah, len(jumlah_y))).astype(np.int64)
+    rho = np.zeros(jumlah)
+    for c in range(len(jumlah_x) - 1):
+        perlu = np.full(jumlah, jumlah_x[c], dtype=np.int64)
+        sisa_total = sisa.sum(axis=1)
+        for j in range(len(jumlah_y)):
+            sisa_total -= sisa[:, j]
+            k = rng.hypergeometric(sisa[:, j], sisa_total, perlu)
+            rho += zx[c] * zy[j] * k
+            sisa[:, j] -= k
+            perlu -= k
+            if not perlu.any():
+                break
+    return rho + zx[-1] * (sisa @ zy)
+
+def _resampling_satu_faktor(x, y, rho, jumlah, alpha, rng):
+    """Interval bootstrap persentil untuk rho dan p-value permutasi dua sisi untuk satu faktor.
+
+    Pengamatan dipadatkan menjadi pasangan (x, y) unik beserta frekuensinya. Bootstrap
+    menarik frekuensi baru secara multinomial, sehingga biaya per resampling sebanding dengan
+    jumlah pasangan unik (jawaban survei dan IPK bernilai diskret), bukan jumlah responden.
+    """
+    n = len(x)
+    unik_x, kode_x = np.unique(x, return_inverse=True)
+    unik_y, kode_y = np.unique(y, return_inverse=True)
+    ux, uy = len(unik_x), len(unik_y)
+    pasangan, frekuensi = np.unique(kode_x.reshape(-1) * uy + kode_y.reshape(-1), return_counts=True)
+    px, py = pasangan // uy, pasangan % uy
+    blok = max(1, MAKS_ELEMEN_BLOK_RESAMPLING // len(pasangan))
+
+    rho_boot = []
+    for mulai in range(0, jumlah, blok):
+        bobot = rng.multinomial(n, frekuensi / n, size=min(blok, jumlah - mulai)).astype(float)
+        rho_boot.append(_korelasi_berbobot(_rank_berbobot(px, bobot, ux), _rank_berbobot(py, bobot, uy), bobot))
+    rho_boot = np.concatenate(rho_boot)
+
+    # Permutasi tidak mengubah rank, cukup mengacak pasangan rank y terhadap rank x
+    jumlah_x, jumlah_y = np.bincount(px, frekuensi, ux), np.bincount(py, frekuensi, uy)
+    rank_x = _rank_berbobot(np.arange(ux), jumlah_x[None, :], ux)[0]
+    rank_y = _rank_berbobot(np.arange(uy), jumlah_y[None, :], uy)[0]
+    zx = (rank_x - (n + 1) / 2) / (np.sqrt(jumlah_x @ (rank_x - (n + 1) / 2) ** 2 / n) * n)
+    zy = (rank_y - (n + 1) / 2) / np.sqrt(jumlah_y @ (rank_y - (n + 1) / 2) ** 2 / n)
+    if ux > uy:
+        zx, zy, jumlah_x, jumlah_y = zy, zx, jumlah_y, jumlah_x
+
+    if (len(zx) - 1) * len(zy) * 4 < n:
+        rho_perm = _permutasi_per_level(zx, zy, jumlah_x.astype(np.int64), jumlah_y.astype(np.int64), jumlah, rng)
+    else:
+        nilai_x, nilai_y = np.repeat(zx, jumlah_x.astype(np.int64)), np.repeat(zy, jumlah_y.astype(np.int64))
+        blok = max(1, MAKS_ELEMEN_BLOK_RESAMPLING // n)
+        rho_perm = np.concatenate([
+            rng.permuted(np.broadcast_to(nilai_y, (min(blok, jumlah - mulai), n)), axis=1) @ nilai_x
+            for mulai in range(0, jumlah, blok)
+        ])
+    lebih_ekstrem = int((np.abs(rho_perm) >= abs(rho) - 1e-12).sum())
+
+    ci_bawah, ci_atas = np.nanpercentile(rho_boot, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+    return ci_bawah, ci_atas, (lebih_ekstrem + 1) / (jumlah + 1)
+
+def hitung_spearman_resampling(data, factor_list, target="IPK", jumlah=2000, alpha=0.05, seed=0, pekerja=None):
+    """Interval kepercayaan bootstrap untuk rho dan p-value permutasi setiap faktor.
+
+    Setiap faktor memakai baris pairwise-complete seperti hitung_spearman_batch. Ribuan
+    resampling diproses sebagai matriks NumPy per blok, dan faktor-faktor dikerjakan paralel
+    di beberapa thread. Hasil deterministik untuk seed yang sama, berapa pun jumlah pekerja.
+    Mengembalikan DataFrame berindeks faktor dengan kolom ci_bawah, ci_atas, dan p_permutasi.
+    """
+    dasar = hitung_spearman_batch(data, factor_list, target)
+    y_semua = data[target].astype(float).to_numpy()
+    rng_faktor = np.random.SeedSequence(seed).spawn(len(dasar))
+
+    def kerjakan(i):
+        faktor = dasar.index[i]
+        x = data[faktor].astype(float).to_numpy()
+        valid = ~np.isnan(x) & ~np.isnan(y_semua)
+        if valid.sum() < 3 or np.isnan(dasar["rho"].iloc[i]):
+            return np.nan, np.nan, np.nan
+        return _resampling_satu_faktor(
+            x[valid], y_semua[valid], dasar["rho"].iloc[i], jumlah, alpha, np.random.default_rng(rng_faktor[i])
+        )
+
+    with ThreadPoolExecutor(max_workers=pekerja or os.cpu_count()) as executor:
+        hasil = list(executor.map(kerjakan, range(len(dasar))))
+    return pd.DataFrame(hasil, index=dasar.index, columns=["ci_bawah", "ci_atas", "p_permutasi"])
+
+@st.cache_data(max_entries=4 * MAKS_CACHE_DATASET, show_spinner="Menghitung bootstrap dan permutasi...")
+def spearman_resampling(kunci_data, _data, faktor, jumlah):
+    """hitung_spearman_resampling untuk satu kelompok faktor, disimpan per (dataset, faktor, jumlah)."""
+    return hitung_spearman_resampling(_data, list(faktor), jumlah=jumlah)
+
+def tabel_spearman(hasil, factor_list, resampling=None):
+    """Menyusun tabel interpretasi (kekuatan, arah, signifikansi) dari hasil hitung_spearman_batch.
+
+    Jika `resampling` (hasil hitung_spearman_resampling) diberikan, tabel mendapat kolom
+    interval kepercayaan bootstrap dan p-value permutasi.
+    """
     results = []
     for factor in factor_list:
-        if factor in data.columns:
-            # Drop NaN rows only for the current factor and IPK
-            temp_data = data[[factor, 'IPK']].dropna()
+        if factor in hasil.index:
+            rho, p_value, n = hasil.loc[factor, ["rho", "p_value", "n"]]
             
-            if len(temp_data) > 1:
-                rho, p_value = spearmanr(temp_data[factor], temp_data['IPK'])
+            if n > 1:
                 
                 # Menentukan Kekuatan dan Arah Hubungan
                 abs_rho = abs(rho)
@@ -243,18 +1596,34 @@ def run_spearman_correlation(data, factor_list, factor_name):
                 arah = "Positif (+)" if rho > 0 else "Negatif (-)" if rho < 0 else "Tidak Ada"
                 signifikan = "Signifikan (P≤0.05)" if p_value <= 0.05 else "Tidak Signifikan (P>0.05)"
                 
-                results.append({
+                baris = {
                     "Faktor": factor,
                     "Koefisien (rho)": f"{rho:.4f}",
                     "P-value": f"{p_value:.4f}",
                     "Kekuatan Hubungan": kekuatan,
                     "Arah Hubungan": arah,
                     "Signifikansi": signifikan
-                })
+                }
             else:
-                results.append({"Faktor": factor, "Koefisien (rho)": "N/A", "P-value": "N/A", "Kekuatan Hubungan": "N/A", "Arah Hubungan": "N/A", "Signifikansi": "Data Kurang"})
+                baris = {"Faktor": factor, "Koefisien (rho)": "N/A", "P-value": "N/A", "Kekuatan Hubungan": "N/A", "Arah Hubungan": "N/A", "Signifikansi": "Data Kurang"}
+
+            if resampling is not None:
+                ci_bawah, ci_atas, p_permutasi = resampling.loc[factor, ["ci_bawah", "ci_atas", "p_permutasi"]]
+                baris["CI 95% (rho)"] = f"[{ci_bawah:.4f}, {ci_atas:.4f}]" if not np.isnan(ci_bawah) else "N/A"
+                baris["P-value Permutasi"] = f"{p_permutasi:.4f}" if not np.isnan(p_permutasi) else "N/A"
+            results.append(baris)
+
+    return pd.DataFrame(results)
 
-    st.table(pd.DataFrame(results))
+def run_spearman_correlation(data, factor_list, factor_name, hasil=None, resampling=None):
+    """Menampilkan tabel korelasi Spearman; `hasil` adalah tabel hitung_spearman_batch yang sudah dihitung
+    dan `resampling` (opsional) tabel hitung_spearman_resampling."""
+    st.subheader(f"Tabel Hasil Uji Korelasi Spearman: {factor_name}")
+
+    if hasil is None:
+        hasil = hitung_spearman_batch(data, factor_list)
+    
+    st.table(tabel_spearman(hasil, factor_list, resampling))
     
     # Penjelasan (Menggunakan r-string)
     st.markdown("### Interpretasi Hasil")
@@ -263,239 +1632,490 @@ def run_spearman_correlation(data, factor_list, factor_name):
     - **P-value**: Jika $P \leq 0.05$, hubungan dikatakan **Signifikan**, artinya ada hubungan statistik yang nyata antara faktor dan IPK.
     - Semua faktor dalam kelompok ini menunjukkan hubungan yang **Sangat Lemah** atau **Lemah** dengan IPK.
     """)
+    if resampling is not None:
+        st.info(r"""
+    - **CI 95% (rho)**: Interval kepercayaan bootstrap persentil; jika interval tidak memuat 0, hubungan cenderung nyata.
+    - **P-value Permutasi**: Proporsi pengacakan pasangan faktor-IPK yang menghasilkan $|rho|$ setidaknya sebesar hasil pengamatan. Lebih andal daripada P-value asimtotik bila jumlah responden kecil.
+    """)
 
 # --- Fungsi Regresi Linier Berganda ---
-def run_linear_regression(data, X_cols, factor_name):
+def siapkan_regresi(data, X_cols, target="IPK", k_fold=JUMLAH_FOLD_CV, random_state=42):
+    """Menyiapkan statistik cukup OLS (Gram matrix per fold) untuk seluruh faktor sekaligus.
+
+    NaN diisi dengan mean kolom agar regresi bisa jalan. Gram matrix Z'Z, Z'y, y'y, dan
+    jumlah y disimpan per fold sehingga model untuk subset faktor mana pun (beserta
+    validasi silang k-fold) dapat dihitung tanpa membaca ulang data.
+    """
+    faktor = [c for c in dict.fromkeys(X_cols) if c in data.columns and data[c].notna().any()]
+    X = data[faktor].astype(float)
+    X = X.fillna(X.mean())
+    y = data[target].astype(float)
+    y = y.fillna(y.mean()).to_numpy()
+
+    # Kolom pertama adalah intersep
+    Z = np.column_stack([np.ones(len(X)), X.to_numpy()])
+    rng = np.random.default_rng(random_state)
+    fold = rng.permutation(len(Z)) % k_fold
+
+    gram, zy, yy, sy, n = [], [], [], [], []
+    for f in range(k_fold):
+        Zf, yf = Z[fold == f], y[fold == f]
+        gram.append(Zf.T @ Zf)
+        zy.append(Zf.T @ yf)
+        yy.append(yf @ yf)
+        sy.append(yf.sum())
+        n.append(len(yf))
+
+    return {
+        "faktor": faktor, "Z": Z, "y": y, "fold": fold,
+        "gram": np.stack(gram), "zy": np.stack(zy),
+        "yy": np.array(yy), "sy": np.array(sy), "n": np.array(n),
+    }
+
+@st.cache_resource(max_entries=MAKS_CACHE_DATASET, show_spinner=False)
+def statistik_regresi(kunci_data, _data):
+    """Statistik cukup regresi seluruh faktor di FAKTOR_GROUPS, dihitung sekali per dataset (kunci_data)."""
+    return siapkan_regresi(_data, [col for group in FAKTOR_GROUPS.values() for col in group])
+
+def hitung_regresi(statistik, X_cols):
+    """Menghitung OLS untuk subset faktor dari statistik cukup hasil siapkan_regresi.
+
+    Mengembalikan koefisien beserta standard error, t, dan p-value dari model penuh,
+    serta metrik MAE/MSE/RMSE/R² per fold dari validasi silang k-fold.
+    """
+    from scipy.special import stdtr
+
+    faktor = [c for c in X_cols if c in statistik["faktor"]]
+    idx = [0] + [1 + statistik["faktor"].index(c) for c in faktor]
+    ix = np.ix_(idx, idx)
+
+    gram_total = statistik["gram"].sum(axis=0)[ix]
+    zy_total = statistik["zy"].sum(axis=0)[idx]
+    yy_total = statistik["yy"].sum()
+    n_total = statistik["n"].sum()
+    p = len(idx)
+
+    # Model penuh: beta = (Z'Z)^-1 Z'y beserta inferensinya
+    beta = np.linalg.lstsq(gram_total, zy_total, rcond=None)[0]
+    sse = yy_total - 2 * beta @ zy_total + beta @ gram_total @ beta
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma2 = max(sse, 0.0) / (n_total - p)
+        se = np.sqrt(np.clip(np.diag(sigma2 * np.linalg.pinv(gram_total)), 0, None))
+        t_stat = beta / se
+        p_value = 2 * stdtr(n_total - p, -np.abs(t_stat))
+
+    # Validasi silang: model fold f dilatih dari Gram total dikurangi Gram fold f
+    k_fold = len(statistik["n"])
+    beta_fold = np.column_stack([
+        np.linalg.lstsq(gram_total - statistik["gram"][f][ix], zy_total - statistik["zy"][f][idx], rcond=None)[0]
+        for f in range(k_fold)
+    ])
+    fold = statistik["fold"]
+    y_pred = (statistik["Z"][:, idx] @ beta_fold)[np.arange(len(fold)), fold]
+    error = statistik["y"] - y_pred
+
+    n_fold = statistik["n"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mae = np.bincount(fold, weights=np.abs(error), minlength=k_fold) / n_fold
+        mse = np.bincount(fold, weights=error ** 2, minlength=k_fold) / n_fold
+        sst = statistik["yy"] - statistik["sy"] ** 2 / n_fold
+        # Fold kosong, berisi satu baris, atau IPK konstan tidak punya variasi: R² tidak terdefinisi
+        # (batas relatif menyerap sisa pembulatan y'y - (Σy)²/n pada data konstan)
+        r2 = np.where(sst > 1e-12 * np.maximum(statistik["yy"], 1.0), 1 - mse * n_fold / sst, np.nan)
+
+    return {
+        "koefisien": pd.DataFrame({
+            "Faktor": faktor,
+            "Pengaruh terhadap IPK": beta[1:],
+            "Std. Error": se[1:],
+            "t": t_stat[1:],
+            "P-value": p_value[1:],
+        }),
+        "intersep": beta[0],
+        "cv": pd.DataFrame({"MAE": mae, "MSE": mse, "RMSE": np.sqrt(mse), "R²": r2}),
+        "n": n_total,
+    }
+
+def run_linear_regression(data, X_cols, factor_name, statistik=None):
+    """Menampilkan hasil regresi; `statistik` adalah hasil siapkan_regresi yang sudah dihitung."""
     st.subheader(f"Tabel Hasil Regresi Linear Berganda: {factor_name}")
 
+    if statistik is None:
+        statistik = siapkan_regresi(data, X_cols)
+
     # Perbaikan Error Regresi: Hanya pilih kolom yang benar-benar ada di data
-    X_cols_available = [col for col in X_cols if col in data.columns]
+    X_cols_available = [col for col in X_cols if col in statistik["faktor"]]
     
     if len(X_cols_available) < 1:
         st.error(f"Faktor tidak ditemukan di data master: {factor_name}")
         return
 
-    # Isi NaN dengan mean agar regresi bisa jalan
-    X = data[X_cols_available].fillna(data[X_cols_available].mean()) 
-    y = data["IPK"].fillna(data["IPK"].mean())
-    
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # Buat dan latih model
-    model = LinearRegression()
-    model.fit(X_train, y_train)
-    y_pred = model.predict(X_test)
+    hasil = hitung_regresi(statistik, X_cols_available)
     
     # Koefisien
-    coefficients = pd.DataFrame({
-        "Faktor": X_cols_available,
-        "Pengaruh terhadap IPK": model.coef_
-    })
-    st.table(coefficients)
+    st.table(hasil["koefisien"].style.format({
+        "Pengaruh terhadap IPK": "{:.4f}", "Std. Error": "{:.4f}", "t": "{:.4f}", "P-value": "{:.4f}"
+    }))
     
-    # Evaluasi
-    mae = mean_absolute_error(y_test, y_pred)
-    mse = mean_squared_error(y_test, y_pred)
-    rmse = np.sqrt(mse)
-    r2 = r2_score(y_test, y_pred)
+    # Evaluasi (rata-rata dan simpangan baku antar fold)
+    cv = hasil["cv"]
+    k_fold = len(cv)
+    if hasil["n"] < k_fold:
+        st.warning(
+            f"Data kurang: hanya {hasil['n']} responden, sedangkan validasi silang {k_fold}-fold "
+            f"membutuhkan minimal {k_fold} responden. Evaluasi model tidak ditampilkan."
+        )
+        return
+    mae, mse, rmse, r2 = cv.mean()
     
-    st.markdown("### Evaluasi Model")
+    st.markdown(f"### Evaluasi Model (Validasi Silang {k_fold}-Fold)")
     eval_df = pd.DataFrame({
         "Metrik": ["MAE", "MSE", "RMSE", "R²"],
-        "Nilai": [f"{mae:.4f}", f"{mse:.4f}", f"{rmse:.4f}", f"{r2:.4f}"]
+        "Nilai": [f"{m:.4f} ± {sd:.4f}" for m, sd in zip(cv.mean(), cv.std())]
     }).set_index("Metrik")
     st.table(eval_df)
     
     # Penjelasan (Menggunakan fr-string)
     st.markdown("### Interpretasi Hasil Regresi")
     st.info(fr"""
-    1. **Pengaruh Koefisien (B)**: Nilai menunjukkan perubahan IPK yang diprediksi jika faktor tersebut naik 1 unit, dengan asumsi faktor lain konstan.
+    1. **Pengaruh Koefisien (B)**: Nilai menunjukkan perubahan IPK yang diprediksi jika faktor tersebut naik 1 unit, dengan asumsi faktor lain konstan. Jika **P-value** $\leq 0.05$, pengaruh faktor tersebut signifikan secara statistik.
     2. **MAE ({mae:.4f})**: Rata-rata selisih antara IPK prediksi dan IPK aktual adalah $\sim {mae:.2f}$ poin.
     3. **RMSE ({rmse:.4f})**: Error prediksi dalam skala IPK adalah $\sim {rmse:.2f}$ poin.
     4. **$R^2$ ({r2:.4f})**: Nilai ini menunjukkan proporsi variasi IPK yang dapat dijelaskan oleh faktor-faktor dalam model. Nilai yang mendekati 1 menunjukkan model yang sangat baik. Jika nilai $R^2$ **sangat rendah** (atau negatif), model ini **tidak efektif** dalam memprediksi IPK.
+    5. Seluruh metrik adalah rata-rata dari {k_fold} fold validasi silang (± simpangan baku), sehingga lebih stabil dibanding satu kali pembagian data latih/uji.
     """)
 
-# --- Konfigurasi Halaman Streamlit ---
-st.set_page_config(layout="wide")
+# --- Bagian Halaman Analisis ---
+# Setiap bagian adalah fragment: interaksi widget di dalamnya hanya menjalankan ulang bagian
+# itu sendiri, dan hanya bagian yang sedang dipilih yang dijalankan pada setiap rerun.
+BAGIAN_ANALISIS = ["Visualisasi Deskriptif", "Hasil Uji Korelasi Spearman", "Hasil Regresi Linear Berganda", "Detail Mahasiswa"]
+
+@st.fragment
+@profil_bagian
+def bagian_deskriptif(df, df1, kunci_data):
+    """Bagian 1: visualisasi deskriptif dari kubus agregat."""
+    # Kubus agregat dibangun sekali per dataset dan hanya saat bagian ini dibuka
+    with profil_tahap("tab1/kubus_agregat", baris=len(df)):
+        ringkasan = kubus_agregat(kunci_data, df, df1)
+
+    with profil_tahap("tab1/render"):
+        st.header("Visualisasi Utama Performansi Akademik")
+
+        unique_angkatan = list(ringkasan["angkatan"].index)
+
+        # --- Filter Interaktif untuk Bagian ini ---
+        # Filter berada di dalam fragment (bukan sidebar) agar perubahannya hanya menjalankan ulang bagian ini
+        st.subheader("Filter Visualisasi")
+        kol_filter_tren, kol_filter_status = st.columns(2)
+        selected_angkatan_tren = kol_filter_tren.multiselect(
+            "Pilih Angkatan untuk Tren IPS:",
+            unique_angkatan,
+            default=unique_angkatan # Default menampilkan semua
+        )
+        selected_angkatan_kelulusan = kol_filter_status.selectbox(
+            "Pilih Angkatan untuk Status Kelulusan:",
+            unique_angkatan,
+            index=len(unique_angkatan) - 1 # Default angkatan terakhir
+        )
+
+        # --- Row 1: Distribusi Angkatan dan Rata-rata IPK ---
+        col1, col2 = st.columns(2)
 
-st.markdown("<h1 style='text-align: center;'>📊 Aplikasi Analisis Data Mahasiswa</h1>", unsafe_allow_html=True)
-st.markdown("<h4 style='text-align: center; margin-bottom: 20px;'>Analisis Deskriptif, Korelasi Spearman, dan Regresi Linear Berganda</h4>", unsafe_allow_html=True)
+        # 1. Distribusi Mahasiswa per Angkatan
+        with col1:
+            st.subheader("Distribusi Jumlah Mahasiswa Berdasarkan Angkatan")
+            df_angkatan_count = ringkasan["angkatan"][["JUMLAH_MAHASISWA"]].reset_index()
+            st.image(render_grafik(
+                (kunci_data, "distribusi_angkatan"),
+                lambda: grafik_distribusi_angkatan(df_angkatan_count)
+            ), width="stretch")
 
-# Input File
-with st.container(): 
-    st.markdown("<p style='text-align: center; font-size: 16px; font-weight: bold;'>📂 Upload File Data Mahasiswa dan Survei yang sudah dicompile (.xlsx)</p>", unsafe_allow_html=True)
-    uploaded_file = st.file_uploader(
-        "Upload File", 
-        type="xlsx",
-        label_visibility='hidden' 
+        # 2. Rata-rata IPK per Angkatan (Interaktif)
+        with col2:
+            st.subheader("Rata-rata IPK Mahasiswa per Angkatan")
+            avg_ipk_by_angkatan = ringkasan["angkatan"][["IPK"]].reset_index()
+            st.image(render_grafik(
+                (kunci_data, "ipk_angkatan"),
+                lambda: grafik_ipk_angkatan(avg_ipk_by_angkatan)
+            ), width="stretch")
+
+        st.markdown("---")
+
+        # --- Row 2: Tren IPS dan Status Kelulusan ---
+        col3, col4 = st.columns(2)
+
+        # 3. Tren Rata-rata IPS per Semester (Interaktif berdasarkan Angkatan)
+        with col3:
+            st.subheader("Tren Rata-Rata IPS Berdasarkan Semester")
+
+            if selected_angkatan_tren:
+                # Potong kubus berdasarkan angkatan yang dipilih
+                ips = ringkasan["ips"]
+                avg_ips_by_semester = ips[ips.index.get_level_values("ANGKATAN").isin(selected_angkatan_tren)]
+
+                if not avg_ips_by_semester.empty:
+                    # Mengurutkan berdasarkan urutan yang telah dideklarasikan (kategori semester berurutan)
+                    avg_ips_by_semester = avg_ips_by_semester["IPS"].reset_index().sort_values('SEMESTER_AMBIL', kind="stable")
+                    avg_ips_by_semester['SEMESTER_AMBIL'] = avg_ips_by_semester['SEMESTER_AMBIL'].astype(str)
+
+                    st.image(render_grafik(
+                        (kunci_data, "tren_ips", tuple(selected_angkatan_tren)),
+                        lambda: grafik_tren_ips(avg_ips_by_semester, selected_angkatan_tren)
+                    ), width="stretch")
+                else:
+                    st.info("Tidak ada data IPS untuk angkatan yang dipilih.")
+            else:
+                st.info("Silakan pilih minimal satu Angkatan pada Filter Visualisasi.")
+
+        # 4. Proporsi Status Kelulusan (Interaktif berdasarkan Angkatan dari Sidebar)
+        with col4:
+            st.subheader(f"Proporsi Status Kelulusan Angkatan {selected_angkatan_kelulusan}")
+
+            # Ambil jumlah status untuk angkatan yang dipilih dari kubus
+            if selected_angkatan_kelulusan in ringkasan["status"].index.get_level_values("ANGKATAN"):
+                status_counts = ringkasan["status"].loc[selected_angkatan_kelulusan]
+
+                st.image(render_grafik(
+                    (kunci_data, "status_kelulusan", selected_angkatan_kelulusan),
+                    lambda: grafik_status_kelulusan(status_counts, selected_angkatan_kelulusan)
+                ), width="stretch")
+            else:
+                st.warning(f"Data status kelulusan untuk Angkatan {selected_angkatan_kelulusan} tidak tersedia.")
+
+        st.markdown("---")
+
+        # --- Row 3: Retensi Kohort Seluruh Angkatan ---
+        st.subheader("Kurva Retensi Kohort per Angkatan")
+        st.markdown("Proporsi mahasiswa setiap angkatan yang masih studi, sudah lulus, atau dropout pada setiap semester sejak masuk. Semester yang belum dilalui suatu angkatan tidak ditampilkan.")
+        with profil_tahap("tab1/retensi_kohort", baris=len(df1)):
+            retensi = retensi_kohort(kunci_data, df, df1)
+        if retensi.empty:
+            st.info("Data semester tidak cukup untuk menghitung retensi kohort.")
+        else:
+            st.image(render_grafik(
+                (kunci_data, "retensi_kohort"),
+                lambda: grafik_retensi_kohort(retensi)
+            ), width="stretch")
+            with st.expander("Tabel Retensi Kohort"):
+                st.dataframe(
+                    retensi.pivot_table(index=["ANGKATAN", "SEMESTER_KE"], columns="KEADAAN", values="PROPORSI", observed=True)[KEADAAN_RETENSI],
+                    width="stretch"
+                )
+
+@st.fragment
+@profil_bagian
+def bagian_korelasi(data_master, kunci_data):
+    """Bagian 2: uji korelasi Spearman faktor survei vs IPK."""
+    st.header("Hasil Uji Korelasi Spearman vs IPK")
+    st.markdown("Uji ini mengukur kekuatan dan arah hubungan monontonik antara faktor survei dengan IPK.")
+
+    selected_group = st.selectbox(
+        "Pilih Kelompok Faktor untuk Uji Korelasi:",
+        list(FAKTOR_GROUPS.keys())
     )
 
-if uploaded_file is not None:
-    df, df1, data_master = load_data(uploaded_file)
-    
-    if df is not None:
-        # Pilihan Menu
-        tab1, tab2, tab3 = st.tabs(["Visualisasi Deskriptif", "Hasil Uji Korelasi Spearman", "Hasil Regresi Linear Berganda"])
-
-        # ====================================================================
-        # TAB 1: VISUALISASI DESKRIPTIF
-        # ====================================================================
-        with tab1:
-            st.header("Visualisasi Utama Performansi Akademik")
-            
-            unique_angkatan = sorted(df['ANGKATAN'].unique())
-            
-            # --- Sidebar/Filter Interaktif Global untuk Tab ini ---
-            st.sidebar.header("Filter Visualisasi")
-            selected_angkatan_tren = st.sidebar.multiselect(
-                "Pilih Angkatan untuk Tren IPS:",
-                unique_angkatan,
-                default=unique_angkatan # Default menampilkan semua
-            )
-            selected_angkatan_kelulusan = st.sidebar.selectbox(
-                "Pilih Angkatan untuk Status Kelulusan:",
-                unique_angkatan,
-                index=len(unique_angkatan) - 1 # Default angkatan terakhir
+    kol_resampling, kol_jumlah = st.columns([2, 1])
+    pakai_resampling = kol_resampling.checkbox(
+        "Hitung interval kepercayaan bootstrap dan p-value permutasi",
+        help="Disarankan bila jumlah responden kecil; p-value asimtotik kurang andal."
+    )
+    jumlah_resampling = kol_jumlah.selectbox(
+        "Jumlah resampling:", PILIHAN_RESAMPLING, index=1, disabled=not pakai_resampling
+    )
+
+    # Tabel seluruh faktor dihitung sekali per dataset; pergantian kelompok hanya memotong tabel
+    with profil_tahap("tab2/spearman", baris=len(data_master)):
+        hasil_spearman = spearman_semua_faktor(kunci_data, data_master)
+    resampling = None
+    if pakai_resampling:
+        with profil_tahap("tab2/spearman_resampling", baris=len(data_master)):
+            resampling = spearman_resampling(
+                kunci_data, data_master, tuple(FAKTOR_GROUPS[selected_group]), jumlah_resampling
             )
+    with profil_tahap("tab2/render"):
+        run_spearman_correlation(
+            data_master, FAKTOR_GROUPS[selected_group], selected_group,
+            hasil=hasil_spearman, resampling=resampling
+        )
 
-            # --- Row 1: Distribusi Angkatan dan Rata-rata IPK ---
-            col1, col2 = st.columns(2)
-            
-            # 1. Distribusi Mahasiswa per Angkatan
-            with col1:
-                st.subheader("Distribusi Jumlah Mahasiswa Berdasarkan Angkatan")
-                df_angkatan_count = df.groupby('ANGKATAN')['NIM'].nunique().reset_index()
-                df_angkatan_count.rename(columns={'NIM': 'JUMLAH_MAHASISWA'}, inplace=True)
-                
-                fig, ax = plt.subplots(figsize=(8, 5))
-                sns.barplot(x='ANGKATAN', y='JUMLAH_MAHASISWA', data=df_angkatan_count, palette='Spectral', ax=ax)
-                for index, row in df_angkatan_count.iterrows():
-                    ax.text(row.name, row['JUMLAH_MAHASISWA'] + 5, str(row['JUMLAH_MAHASISWA']), color='black', ha="center", fontsize=10)
-                
-                ax.set_title('Distribusi Jumlah Mahasiswa')
-                ax.set_xlabel('Angkatan Masuk')
-                ax.set_ylabel('Jumlah Mahasiswa')
-                ax.grid(axis='y', linestyle='--', alpha=0.7)
-                st.pyplot(fig)
-            
-            # 2. Rata-rata IPK per Angkatan (Interaktif)
-            with col2:
-                st.subheader("Rata-rata IPK Mahasiswa per Angkatan")
-                avg_ipk_by_angkatan = df1.groupby('ANGKATAN')['IPK'].mean().reset_index()
-                
-                fig, ax = plt.subplots(figsize=(6, 4))
-                sns.barplot(x='ANGKATAN', y='IPK', data=avg_ipk_by_angkatan, palette='viridis', ax=ax)
-                for index, row in avg_ipk_by_angkatan.iterrows():
-                    ax.text(index, row.IPK + 0.01, round(row.IPK, 2), color='black', ha="center")
-                    
-                ax.set_title('Rata-rata IPK Mahasiswa per Angkatan')
-                ax.set_xlabel('Angkatan')
-                ax.set_ylabel('Rata-rata IPK')
-                ax.set_ylim(min(2.5, avg_ipk_by_angkatan['IPK'].min()), 4.0)
-                ax.grid(axis='y', linestyle='--')
-                st.pyplot(fig)
-
-            st.markdown("---")
-
-            # --- Row 2: Tren IPS dan Status Kelulusan ---
-            col3, col4 = st.columns(2)
-            
-            # 3. Tren Rata-rata IPS per Semester (Interaktif berdasarkan Angkatan)
-            with col3:
-                st.subheader("Tren Rata-Rata IPS Berdasarkan Semester")
-                
-                if selected_angkatan_tren:
-                    # Filter data berdasarkan angkatan yang dipilih
-                    df_ips_filtered = df[df['ANGKATAN'].isin(selected_angkatan_tren) & df['IPS'].notna()]
-                    
-                    if not df_ips_filtered.empty:
-                        avg_ips_by_semester = df_ips_filtered.groupby(['SEMESTER_AMBIL', 'ANGKATAN'])['IPS'].mean().reset_index()
-                        
-                        # Mengurutkan berdasarkan urutan yang telah dideklarasikan
-                        avg_ips_by_semester['ORDER'] = avg_ips_by_semester['SEMESTER_AMBIL'].apply(
-                            lambda x: SEMESTER_URUT.index(str(x)) if str(x) in SEMESTER_URUT else 999
-                        )
-                        avg_ips_by_semester = avg_ips_by_semester.sort_values('ORDER')
-
-                        fig, ax = plt.subplots(figsize=(6, 4))
-                        
-                        # Gunakan hue='ANGKATAN' agar setiap angkatan memiliki garis warna berbeda
-                        sns.lineplot(
-                            x='SEMESTER_AMBIL', 
-                            y='IPS', 
-                            hue='ANGKATAN', 
-                            data=avg_ips_by_semester, 
-                            marker='o', 
-                            ax=ax,
-                            palette=sns.color_palette("tab10", n_colors=len(selected_angkatan_tren))
-                        )
-                        ax.set_title(f'Tren Rata-Rata IPS (Angkatan: {", ".join(map(str, selected_angkatan_tren))})')
-                        ax.set_xlabel('Semester Akademik')
-                        ax.set_ylabel('Rata-Rata IPS')
-                        ax.legend(title='Angkatan')
-                        ax.grid(True)
-                        st.pyplot(fig)
-                    else:
-                        st.info("Tidak ada data IPS untuk angkatan yang dipilih.")
-                else:
-                    st.info("Silakan pilih minimal satu Angkatan dari Filter Visualisasi di Sidebar.")
+@st.fragment
+@profil_bagian
+def bagian_regresi(data_master, kunci_data):
+    """Bagian 3: regresi linear berganda faktor survei vs IPK."""
+    st.header("Hasil Regresi Linear Berganda vs IPK")
+    st.markdown("Uji ini mengukur bagaimana satu set faktor secara kolektif dapat memprediksi IPK.")
 
-            # 4. Proporsi Status Kelulusan (Interaktif berdasarkan Angkatan dari Sidebar)
-            with col4:
-                st.subheader(f"Proporsi Status Kelulusan Angkatan {selected_angkatan_kelulusan}")
-                
-                # Filter data berdasarkan angkatan yang dipilih
-                df_filtered_angkatan = df1[df1['ANGKATAN'] == selected_angkatan_kelulusan]
-                
-                if not df_filtered_angkatan.empty:
-                    status_counts = df_filtered_angkatan['KELULUSAN_STATUS'].value_counts()
-                    
-                    fig, ax = plt.subplots(figsize=(3, 3))
-                    ax.pie(
-                        status_counts, 
-                        labels=status_counts.index, 
-                        autopct='%1.1f%%',
-                        startangle=140, 
-                        colors=sns.color_palette("Set2"),
-                        wedgeprops={'edgecolor': 'black'}
-                    )
-                    ax.set_title(f'Proporsi Status Mahasiswa Angkatan {selected_angkatan_kelulusan}')
-                    ax.axis('equal')
-                    st.pyplot(fig)
-                else:
-                    st.warning(f"Data status kelulusan untuk Angkatan {selected_angkatan_kelulusan} tidak tersedia.")
+    # Statistik cukup dihitung sekali per dataset; setiap pilihan faktor hanya memotong Gram matrix
+    with profil_tahap("tab3/statistik_regresi", baris=len(data_master)):
+        statistik_reg = statistik_regresi(kunci_data, data_master)
+
+    selected_group_reg = st.selectbox(
+        "Pilih Kelompok Faktor untuk Uji Regresi:",
+        list(FAKTOR_GROUPS.keys()) + ["Pilih Faktor Sendiri"]
+    )
 
-           # st.markdown("---")
+    if selected_group_reg == "Pilih Faktor Sendiri":
+        faktor_reg = st.multiselect("Pilih Faktor untuk Uji Regresi:", statistik_reg["faktor"])
+    else:
+        faktor_reg = FAKTOR_GROUPS[selected_group_reg]
 
-        # ====================================================================
-        # TAB 2: UJI KORELASI SPEARMAN
-        # ====================================================================
-        with tab2:
-            st.header("Hasil Uji Korelasi Spearman vs IPK")
-            st.markdown("Uji ini mengukur kekuatan dan arah hubungan monontonik antara faktor survei dengan IPK.")
-            
-            selected_group = st.selectbox(
-                "Pilih Kelompok Faktor untuk Uji Korelasi:",
-                list(FAKTOR_GROUPS.keys())
+    if faktor_reg:
+        with profil_tahap("tab3/regresi_render"):
+            run_linear_regression(data_master, faktor_reg, selected_group_reg, statistik=statistik_reg)
+    else:
+        st.info("Silakan pilih minimal satu faktor untuk uji regresi.")
+
+@st.fragment
+@profil_bagian
+def bagian_detail_mahasiswa(df, df1, data_master, indeks):
+    """Bagian 4: drill-down satu mahasiswa berdasarkan NIM melalui indeks per mahasiswa."""
+    st.header("Detail Mahasiswa")
+    st.markdown("Cari NIM untuk melihat lintasan IPS, SKS per semester, status kelulusan, dan jawaban survei mahasiswa tersebut.")
+
+    teks_nim = st.text_input("Cari NIM:", placeholder="Contoh: 1089").strip()
+    if not teks_nim:
+        st.info("Masukkan NIM untuk menampilkan detail mahasiswa.")
+        return
+
+    # NIM numerik di data dicocokkan sebagai bilangan bulat
+    nim = int(teks_nim) if pd.api.types.is_integer_dtype(indeks["nim"].dtype) and teks_nim.isdigit() else teks_nim
+    with profil_tahap("tab4/detail_mahasiswa"):
+        detail = detail_mahasiswa(indeks, df, df1, data_master, nim)
+    if detail is None:
+        st.warning(f"NIM {teks_nim} tidak ditemukan pada dataset.")
+        return
+
+    profil = detail["profil"]
+    kol_angkatan, kol_ipk, kol_sks, kol_semester, kol_status = st.columns(5)
+    kol_angkatan.metric("Angkatan", int(profil["ANGKATAN"]))
+    kol_ipk.metric("IPK Terakhir", "-" if pd.isna(profil["IPK"]) else f"{profil['IPK']:.2f}")
+    kol_sks.metric("Total SKS", int(profil["TOTAL_SKS"]))
+    kol_semester.metric("Semester Diambil", int(profil["TOTAL_SEMESTER"]))
+    kol_status.metric("Status", profil["KELULUSAN_STATUS"])
+
+    timeline = detail["timeline"]
+    kol_ips, kol_sks_semester = st.columns(2)
+    with kol_ips:
+        st.subheader("Lintasan IPS dan IPK per Semester")
+        st.line_chart(timeline[["IPS", "IPK"]])
+    with kol_sks_semester:
+        st.subheader("SKS per Semester")
+        st.bar_chart(timeline["SKS"])
+    st.caption("Semester dengan DIAMBIL = False berada di antara semester yang diambil tetapi tidak tercatat di transkrip (mis. cuti).")
+    st.dataframe(timeline, width="stretch")
+
+    st.subheader("Jawaban Survei")
+    if detail["survei"].empty:
+        st.info("Mahasiswa ini tidak tercatat mengisi survei.")
+    else:
+        st.dataframe(detail["survei"], width="stretch")
+
+
+# --- Halaman Streamlit ---
+def main():
+    # --- Konfigurasi Halaman Streamlit ---
+    st.set_page_config(layout="wide")
+
+    st.markdown("<h1 style='text-align: center;'>📊 Aplikasi Analisis Data Mahasiswa</h1>", unsafe_allow_html=True)
+    st.markdown("<h4 style='text-align: center; margin-bottom: 20px;'>Analisis Deskriptif, Korelasi Spearman, dan Regresi Linear Berganda</h4>", unsafe_allow_html=True)
+
+    # Instrumentasi opsional per tahap (waktu, baris, memori) + log terstruktur
+    # (key disimpan di session_state agar fragment bagian dapat memprofilkan dirinya sendiri)
+    profil_aktif = st.sidebar.checkbox("Tampilkan profil performa", value=PROFIL_DEFAULT, key="profil_aktif")
+    if profil_aktif:
+        mulai_profil()
+
+    # Input File
+    with st.container(): 
+        st.markdown("<p style='text-align: center; font-size: 16px; font-weight: bold;'>📂 Upload File Data Mahasiswa dan Survei yang sudah dicompile (.xlsx), atau tabel Transkrip dan Responden terpisah (.csv/.parquet), atau bundel dataset hasil ekspor (.zip)</p>", unsafe_allow_html=True)
+        uploaded_file = st.file_uploader(
+            "Upload File", 
+            type=["xlsx", "csv", "parquet", EKSTENSI_BUNDEL.lstrip(".")],
+            accept_multiple_files=True,
+            label_visibility='hidden' 
+        )
+        # Satu workbook XLSX cukup diproses sebagai satu file
+        if len(uploaded_file) == 1:
+            uploaded_file = uploaded_file[0]
+
+    if uploaded_file:
+        with profil_tahap("load_data_cached") as info:
+            df, df1, data_master, laporan_memori, kunci_data, dari_cache = load_data_cached(uploaded_file)
+            info["cache"] = dari_cache
+
+        if df is not None:
+            # Indikator cache: menandakan apakah file perlu diparsing ulang
+            if dari_cache:
+                st.sidebar.success(f"⚡ Data dimuat dari cache (hash {kunci_data[:8]})")
+            else:
+                st.sidebar.info(f"Data baru diproses dan disimpan ke cache (hash {kunci_data[:8]})")
+
+            with st.sidebar.expander("➕ Tambah Semester Baru", expanded=False):
+                file_semester = st.file_uploader(
+                    "Transkrip semester baru (.xlsx/.csv/.parquet)",
+                    type=["xlsx", "csv", "parquet"],
+                    key="file_semester_baru"
+                )
+                if file_semester is not None and st.button("Tambahkan ke dataset"):
+                    try:
+                        with profil_tahap("tambah_semester"):
+                            df, df1, data_master, laporan_memori, kunci_data, peringatan = tambah_semester_sesi(file_semester)
+                        st.success(f"Semester baru ditambahkan (hash {kunci_data[:8]}).")
+                        for pesan in peringatan:
+                            st.warning(pesan)
+                    except Exception as e:
+                        st.error(f"Gagal menambahkan semester baru: {e}")
+
+            # Ekspor bundel Arrow: unggah kembali untuk membuka dataset ini tanpa preprocessing
+            st.sidebar.download_button(
+                "⬇️ Unduh Bundel Dataset",
+                data=lambda: tulis_bundel(df, df1, data_master, laporan_memori, kunci_data),
+                file_name=f"dataset_{kunci_data[:8]}{EKSTENSI_BUNDEL}",
+                mime="application/zip",
+                help="Tabel hasil preprocessing (format Arrow). Unggah file ini untuk membuka dataset yang sama secara instan.",
             )
-            
-            run_spearman_correlation(data_master, FAKTOR_GROUPS[selected_group], selected_group)
-
-        # ====================================================================
-        # TAB 3: HASIL REGRESI LINEAR BERGANDA
-        # ====================================================================
-        with tab3:
-            st.header("Hasil Regresi Linear Berganda vs IPK")
-            st.markdown("Uji ini mengukur bagaimana satu set faktor secara kolektif dapat memprediksi IPK.")
-            
-            selected_group_reg = st.selectbox(
-                "Pilih Kelompok Faktor untuk Uji Regresi:",
-                list(FAKTOR_GROUPS.keys())
+
+            with st.sidebar.expander("💾 Memori Dataset", expanded=False):
+                st.dataframe(laporan_memori, hide_index=True)
+                status_registri = registri_dataset().status()
+                st.caption(
+                    f"Registri server: {status_registri['dataset']} dataset, "
+                    f"{status_registri['memori_mb']:.1f}/{status_registri['batas_mb']:.0f} MB, "
+                    f"{status_registri['referensi']} sesi aktif"
+                )
+
+            # Indeks NIM -> posisi baris untuk drill-down, dibangun sekali per dataset saat dimuat
+            with profil_tahap("indeks_mahasiswa", baris=len(df)):
+                indeks = indeks_mahasiswa(kunci_data, df, df1, data_master)
+
+            # Pilihan Menu: hanya bagian yang dipilih yang dihitung dan digambar
+            bagian = st.radio(
+                "Bagian Analisis", BAGIAN_ANALISIS, horizontal=True,
+                key="bagian_analisis", label_visibility="collapsed"
             )
 
-            run_linear_regression(data_master, FAKTOR_GROUPS[selected_group_reg], selected_group_reg)
+            if bagian == BAGIAN_ANALISIS[0]:
+                bagian_deskriptif(df, df1, kunci_data)
+            elif bagian == BAGIAN_ANALISIS[1]:
+                bagian_korelasi(data_master, kunci_data)
+            elif bagian == BAGIAN_ANALISIS[2]:
+                bagian_regresi(data_master, kunci_data)
+            else:
+                bagian_detail_mahasiswa(df, df1, data_master, indeks)
+
+    # Jika file belum diunggah
+    else:
+        lepas_dataset_sesi()
+        st.info("Silakan unggah file Excel Anda untuk memulai analisis.")
+
+    # Panel profil performa di sidebar (tahap yang tidak dijalankan karena cache tidak tercatat)
+    catatan_profil = selesai_profil()
+    if profil_aktif:
+        with st.sidebar.expander("⏱️ Profil Performa", expanded=False):
+            tampilkan_profil(catatan_profil)
+
 
-# Jika file belum diunggah
-else:
-    st.info("Silakan unggah file Excel Anda untuk memulai analisis.")
\ No newline at end of file
+# Streamlit menjalankan skrip ini sebagai __main__; saat diimpor (mis. oleh benchmark)
+# hanya fungsi-fungsi analisis yang dimuat tanpa menggambar halaman.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Analisis batch tanpa Streamlit untuk banyak workbook sekaligus.
+
+Setiap workbook (.xlsx), bundel dataset hasil ekspor dashboard (.zip), atau folder berisi
+tabel Transkrip/Responden (.csv/.parquet) di direktori input diproses paralel di beberapa
+proses dengan fungsi yang sama seperti dashboard: jumlah mahasiswa dan rata-rata IPK per
+angkatan, status kelulusan, retensi kohort per semester sejak masuk, tabel korelasi
+Spearman (opsional dengan interval bootstrap dan p-value permutasi), dan tabel regresi
+untuk setiap kelompok faktor. Hasil ditulis ke <output>/<nama workbook>/ dalam format
+CSV, Parquet, dan/atau HTML.
+
+Contoh:
+    python batch_analisis.py data_fakultas/ --output laporan/ --format csv html
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from app import (
+    EKSTENSI_BUNDEL,
+    FAKTOR_GROUPS,
+    baca_bundel,
+    bangun_kubus,
+    hitung_regresi,
+    hitung_retensi_kohort,
+    hitung_spearman_batch,
+    hitung_spearman_resampling,
+    proses_data,
+    siapkan_regresi,
+    tabel_spearman,
+    urutan_dataset,
+)
+
+EKSTENSI_TABEL = (".csv", ".parquet")
+
+
+def cari_input(direktori):
+    """Daftar (nama, [path]) untuk setiap workbook XLSX, bundel dataset, atau folder tabel CSV/Parquet."""
+    daftar = []
+    for entri in sorted(os.scandir(direktori), key=lambda e: e.name):
+        if entri.is_file() and entri.name.lower().endswith((".xlsx", EKSTENSI_BUNDEL)) and not entri.name.startswith("~$"):
+            daftar.append((os.path.splitext(entri.name)[0], [entri.path]))
+        elif entri.is_dir():
+            tabel = [f.path for f in os.scandir(entri.path) if f.name.lower().endswith(EKSTENSI_TABEL)]
+            if tabel:
+                daftar.append((entri.name, sorted(tabel)))
+    return daftar
+
+
+def analisis(paths, resampling=0):
+    """Menjalankan seluruh analisis dashboard untuk satu dataset; mengembalikan {nama tabel: DataFrame}.
+
+    resampling > 0 menambahkan interval bootstrap dan p-value permutasi ke tabel Spearman.
+    Bundel dataset dibaca memory-mapped tanpa preprocessing ulang.
+    """
+    if len(paths) == 1 and paths[0].lower().endswith(EKSTENSI_BUNDEL):
+        df, df1, data_master, laporan_memori, _ = baca_bundel(paths[0])
+        peringatan = []
+    else:
+        files = [open(path, "rb") for path in paths]
+        try:
+            df, df1, data_master, peringatan, laporan_memori = proses_data(files if len(files) > 1 else files[0])
+        finally:
+            for f in files:
+                f.close()
+
+    ringkasan = bangun_kubus(df, df1)
+    hasil = {
+        "angkatan": ringkasan["angkatan"][["JUMLAH_MAHASISWA", "IPK"]].reset_index(),
+        "status_kelulusan": ringkasan["status"].rename("JUMLAH_MAHASISWA").reset_index(),
+        "retensi_kohort": hitung_retensi_kohort(df1, urutan_dataset(df)),
+    }
+
+    semua_faktor = [col for group in FAKTOR_GROUPS.values() for col in group]
+    spearman = hitung_spearman_batch(data_master, semua_faktor)
+    tambahan = hitung_spearman_resampling(data_master, semua_faktor, jumlah=resampling, pekerja=1) if resampling else None
+    statistik = siapkan_regresi(data_master, semua_faktor)
+
+    tabel_korelasi, tabel_koefisien, tabel_evaluasi = [], [], []
+    for nama_kelompok, faktor in FAKTOR_GROUPS.items():
+        tabel_korelasi.append(tabel_spearman(spearman, faktor, tambahan).assign(Kelompok=nama_kelompok))
+        if any(col in statistik["faktor"] for col in faktor):
+            regresi = hitung_regresi(statistik, faktor)
+            tabel_koefisien.append(regresi["koefisien"].assign(Kelompok=nama_kelompok))
+            tabel_evaluasi.append(pd.DataFrame({
+                "Kelompok": nama_kelompok,
+                "Metrik": regresi["cv"].columns,
+                "Rata-rata": regresi["cv"].mean().to_numpy(),
+                "Simpangan Baku": regresi["cv"].std().to_numpy(),
+            }))
+
+    hasil["spearman"] = pd.concat(tabel_korelasi, ignore_index=True)
+    if tabel_koefisien:
+        hasil["regresi_koefisien"] = pd.concat(tabel_koefisien, ignore_index=True)
+        hasil["regresi_evaluasi"] = pd.concat(tabel_evaluasi, ignore_index=True)
+    hasil["peringatan"] = pd.DataFrame({"Pesan": peringatan})
+    hasil["memori"] = laporan_memori
+    return hasil
+
+
+def tulis_laporan(nama, hasil, direktori_output, formats):
+    """Menulis setiap tabel hasil ke <direktori_output>/<nama>/ dalam format yang diminta."""
+    folder = os.path.join(direktori_output, nama)
+    os.makedirs(folder, exist_ok=True)
+    for nama_tabel, tabel in hasil.items():
+        if "csv" in formats:
+            tabel.to_csv(os.path.join(folder, f"{nama_tabel}.csv"), index=False)
+        if "parquet" in formats:
+            tabel.to_parquet(os.path.join(folder, f"{nama_tabel}.parquet"), index=False)
+    if "html" in formats:
+        bagian = [f"<h1>Laporan Analisis: {nama}</h1>"]
+        for nama_tabel, tabel in hasil.items():
+            bagian.append(f"<h2>{nama_tabel.replace('_', ' ').title()}</h2>")
+            bagian.append(tabel.to_html(index=False, float_format=lambda x: f"{x:.4f}"))
+        with open(os.path.join(folder, "laporan.html"), "w", encoding="utf-8") as f:
+            f.write("<html><head><meta charset='utf-8'></head><body>\n" + "\n".join(bagian) + "\n</body></html>\n")
+    return folder
+
+
+def proses_satu(nama, paths, direktori_output, formats, resampling):
+    """Tugas worker: analisis satu dataset lalu tulis laporannya. Dijalankan di proses terpisah."""
+    mulai = time.perf_counter()
+    hasil = analisis(paths, resampling)
+    folder = tulis_laporan(nama, hasil, direktori_output, formats)
+    return folder, time.perf_counter() - mulai
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Direktori berisi workbook .xlsx, bundel .zip, atau folder tabel CSV/Parquet")
+    parser.add_argument("--output", required=True, help="Direktori laporan")
+    parser.add_argument("--format", nargs="+", choices=["csv", "parquet", "html"], default=["csv", "html"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Jumlah proses paralel")
+    parser.add_argument("--resampling", type=int, default=0,
+                        help="Jumlah resampling bootstrap/permutasi Spearman (0 = tidak dihitung)")
+    args = parser.parse_args()
+
+    daftar = cari_input(args.input)
+    if not daftar:
+        print(f"Tidak ada workbook atau tabel di {args.input}", file=sys.stderr)
+        sys.exit(1)
+
+    gagal = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(proses_satu, nama, paths, args.output, args.format, args.resampling): nama
+            for nama, paths in daftar
+        }
+        for future in as_completed(futures):
+            nama = futures[future]
+            try:
+                folder, durasi = future.result()
+                print(f"OK    {nama} ({durasi:.1f} detik) -> {folder}")
+            except Exception as e:
+                gagal += 1
+                print(f"GAGAL {nama}: {e}", file=sys.stderr)
+
+    print(f"{len(daftar) - gagal}/{len(daftar)} dataset berhasil diproses")
+    sys.exit(1 if gagal else 0)
+
+
+if __name__ == "__main__":
+    main()
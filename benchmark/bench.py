@@ -0,0 +1,218 @@
+"""Benchmark per tahap untuk pipeline muat/analisis data mahasiswa.
+
+Mengukur waktu (minimum dari beberapa ulangan) dan puncak memori (tracemalloc) untuk
+setiap tahap: pembacaan file, load_data lengkap, status kelulusan, kubus agregat,
+korelasi Spearman, dan regresi. Waktu impor cold (proses Python baru) untuk app.py dan
+modul berat yang dimuatnya secara lazy (grafik, scipy) diukur terpisah. Hasil dapat
+disimpan sebagai baseline dan dibandingkan pada run berikutnya; tahap yang lebih lambat
+atau memakai puncak memori lebih besar dari toleransinya dilaporkan sebagai regresi.
+
+Contoh:
+    python benchmark/bench.py --baris 1000 10000 100000 --simpan-baseline benchmark/baseline.json
+    python benchmark/bench.py --baris 1000 10000 100000 --baseline benchmark/baseline.json
+    python benchmark/bench.py --input data.xlsx
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+AKAR_REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, AKAR_REPO)
+
+import app  # noqa: E402
+from generate_data import generate, simpan  # noqa: E402
+
+SEMUA_FAKTOR = [col for group in app.FAKTOR_GROUPS.values() for col in group]
+
+# (nama tahap, modul yang diimpor); modul lazy diukur setelah app sudah diimpor
+TAHAP_IMPOR = [
+    ("impor_app", "app"),
+    ("impor_grafik", "matplotlib.pyplot, seaborn"),
+    ("impor_scipy", "scipy.special"),
+]
+
+# Kenaikan puncak memori sekecil ini tidak dianggap regresi (derau alokasi pada data kecil)
+BATAS_SELISIH_MEMORI_MB = 1.0
+
+
+@contextmanager
+def buka(paths):
+    """Membuka file input dalam bentuk yang diterima app.baca_tabel / app.load_data, lalu menutupnya."""
+    files = [open(path, "rb") for path in paths]
+    try:
+        yield files if len(files) > 1 else files[0]
+    finally:
+        for f in files:
+            f.close()
+
+
+def tahap_pipeline(paths):
+    """Daftar (nama tahap, fungsi) berurutan; setiap fungsi menerima hasil tahap sebelumnya."""
+    def baca(_):
+        with buka(paths) as f:
+            return app.baca_tabel(f)
+
+    def load_data(_):
+        with buka(paths) as f:
+            df, df1, data_master, _ = app.load_data(f)
+        if df is None:
+            raise RuntimeError("load_data gagal memuat data")
+        return df, df1, data_master
+
+    def status(data):
+        df, df1, data_master = data
+        urutan = app.urutan_dataset(df)
+        semester = app.hitung_semester_mahasiswa(df, urutan)
+        app.tentukan_status(semester["TOTAL_SEMESTER"], semester["IDX_TERAKHIR"], semester["SEMESTER_MASK"], len(urutan))
+        return data
+
+    def kubus(data):
+        df, df1, data_master = data
+        app.bangun_kubus(df, df1)
+        return data
+
+    def spearman(data):
+        app.hitung_spearman_batch(data[2], SEMUA_FAKTOR)
+        return data
+
+    def regresi(data):
+        statistik = app.siapkan_regresi(data[2], SEMUA_FAKTOR)
+        for faktor in app.FAKTOR_GROUPS.values():
+            app.hitung_regresi(statistik, faktor)
+        return data
+
+    return [
+        ("baca_tabel", baca),
+        ("load_data", load_data),
+        ("status_kelulusan", status),
+        ("kubus_agregat", kubus),
+        ("spearman", spearman),
+        ("regresi", regresi),
+    ]
+
+
+def ukur(paths, ulang):
+    """Menjalankan seluruh tahap dan mengembalikan {tahap: {"detik", "puncak_mb"}}."""
+    hasil = {}
+    data = None
+    for nama, fungsi in tahap_pipeline(paths):
+        durasi = []
+        for _ in range(ulang):
+            mulai = time.perf_counter()
+            keluaran = fungsi(data)
+            durasi.append(time.perf_counter() - mulai)
+
+        # Puncak memori diukur terpisah agar overhead tracemalloc tidak memengaruhi waktu
+        tracemalloc.start()
+        fungsi(data)
+        _, puncak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Tahap baca_tabel tidak menghasilkan input untuk tahap berikutnya
+        if nama != "baca_tabel":
+            data = keluaran
+        hasil[nama] = {"detik": min(durasi), "puncak_mb": puncak / 2**20}
+    return hasil
+
+
+def ukur_impor(ulang):
+    """Waktu impor setiap tahap TAHAP_IMPOR di proses Python baru (cold start)."""
+    hasil = {}
+    for nama, modul in TAHAP_IMPOR:
+        awal = "" if nama == "impor_app" else "import app; "
+        kode = (
+            f"import sys, time, tracemalloc; sys.path.insert(0, {AKAR_REPO!r}); {awal}"
+            f"lacak = sys.argv[1] == '1'; lacak and tracemalloc.start(); mulai = time.perf_counter(); import {modul}; "
+            "print(time.perf_counter() - mulai, tracemalloc.get_traced_memory()[1])"
+        )
+
+        def jalankan(lacak):
+            keluaran = subprocess.run([sys.executable, "-c", kode, lacak], capture_output=True, text=True, check=True)
+            return [float(x) for x in keluaran.stdout.split()]
+
+        durasi = [jalankan("0")[0] for _ in range(ulang)]
+        hasil[nama] = {"detik": min(durasi), "puncak_mb": jalankan("1")[1] / 2**20}
+    return hasil
+
+
+def bandingkan(hasil, baseline, toleransi, toleransi_memori):
+    """Mengembalikan daftar regresi (label, tahap, metrik, nilai baseline, nilai sekarang).
+
+    Metrik "detik" dibandingkan dengan toleransi, "puncak_mb" dengan toleransi_memori;
+    kenaikan puncak memori di bawah BATAS_SELISIH_MEMORI_MB diabaikan sebagai derau.
+    """
+    regresi = []
+    for label, tahap in hasil.items():
+        for nama, nilai in tahap.items():
+            acuan = baseline.get(label, {}).get(nama)
+            if not acuan:
+                continue
+            if nilai["detik"] > acuan["detik"] * (1 + toleransi):
+                regresi.append((label, nama, "detik", acuan["detik"], nilai["detik"]))
+            if (nilai["puncak_mb"] > acuan["puncak_mb"] * (1 + toleransi_memori)
+                    and nilai["puncak_mb"] - acuan["puncak_mb"] > BATAS_SELISIH_MEMORI_MB):
+                regresi.append((label, nama, "puncak_mb", acuan["puncak_mb"], nilai["puncak_mb"]))
+    return regresi
+
+
+def cetak(hasil, baseline):
+    print(f"{'ukuran':>10} {'tahap':<18} {'detik':>10} {'puncak MB':>10} {'vs baseline':>12}")
+    for label, tahap in hasil.items():
+        for nama, nilai in tahap.items():
+            acuan = baseline.get(label, {}).get(nama)
+            rasio = f"{nilai['detik'] / acuan['detik']:.2f}x" if acuan and acuan["detik"] > 0 else "-"
+            print(f"{label:>10} {nama:<18} {nilai['detik']:>10.4f} {nilai['puncak_mb']:>10.1f} {rasio:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baris", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="Ukuran data sintetis (jumlah baris transkrip)")
+    parser.add_argument("--format", choices=["xlsx", "csv", "parquet"], default="xlsx",
+                        help="Format file data sintetis")
+    parser.add_argument("--input", nargs="+", help="Benchmark file nyata, bukan data sintetis")
+    parser.add_argument("--ulang", type=int, default=3, help="Jumlah ulangan per tahap (diambil waktu minimum)")
+    parser.add_argument("--baseline", help="File JSON baseline untuk dibandingkan")
+    parser.add_argument("--simpan-baseline", help="Simpan hasil sebagai baseline JSON")
+    parser.add_argument("--toleransi", type=float, default=0.2, help="Batas perlambatan relatif (0.2 = 20%%)")
+    parser.add_argument("--toleransi-memori", type=float, default=0.2,
+                        help="Batas kenaikan relatif puncak memori (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    hasil = {"impor": ukur_impor(args.ulang)}
+    if args.input:
+        hasil["input"] = ukur(args.input, args.ulang)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            for baris in args.baris:
+                output = os.path.join(tmp, f"data_{baris}" + (".xlsx" if args.format == "xlsx" else ""))
+                paths = simpan(*generate(baris), output, args.format)
+                hasil[str(baris)] = ukur(paths, args.ulang)
+
+    baseline = {}
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    cetak(hasil, baseline)
+
+    if args.simpan_baseline:
+        with open(args.simpan_baseline, "w") as f:
+            json.dump(hasil, f, indent=2)
+        print(f"Baseline disimpan ke {args.simpan_baseline}")
+
+    regresi = bandingkan(hasil, baseline, args.toleransi, args.toleransi_memori)
+    for label, nama, metrik, acuan, sekarang in regresi:
+        satuan = "s" if metrik == "detik" else " MB"
+        print(f"REGRESI {label}/{nama} ({metrik}): {acuan:.4f}{satuan} -> {sekarang:.4f}{satuan}")
+    sys.exit(1 if regresi else 0)
+
+
+if __name__ == "__main__":
+    main()
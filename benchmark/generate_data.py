@@ -0,0 +1,142 @@
+"""Generator data sintetis dengan skema yang sama persis seperti workbook asli.
+
+Menghasilkan sheet 'Transkrip Mhs SI TA 2020-2024', 'MataKuliah', dan 'Responden'
+(atau tabel Transkrip/Responden terpisah dalam CSV/Parquet) dengan kode semester dari
+kode semester 2011-2421 dan kolom pertanyaan survei berbahasa Indonesia, untuk ukuran 1 ribu
+hingga 1 juta baris transkrip.
+
+Contoh:
+    python benchmark/generate_data.py --baris 100000 --output data_100k.xlsx
+    python benchmark/generate_data.py --baris 1000000 --format parquet --output data_1m
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app import (  # noqa: E402
+    SHEET_RESPONDEN,
+    SHEET_TRANSKRIP,
+    SKEMA_SURVEI,
+    urutan_semester_dari_data,
+)
+
+# Rentang semester data sintetis: ganjil 2020/2021 hingga genap 2024/2025
+SEMESTER_URUT = urutan_semester_dari_data(["2011", "2421"])
+
+# Batas bawah rata-rata baris transkrip per mahasiswa; jumlah mahasiswa dilebihkan
+# lalu transkrip dipotong tepat di jumlah baris yang diminta
+MIN_SEMESTER_PER_MAHASISWA = 3
+
+
+def buat_transkrip(jumlah_baris, rng):
+    """Membuat tabel transkrip (satu baris per mahasiswa per semester) secara vektor."""
+    # Angkatan baru masuk di semester ganjil (digit ketiga kode = "1")
+    posisi_masuk = np.array([i for i, kode in enumerate(SEMESTER_URUT) if kode[2] == "1"])
+    n_mhs = max(1, jumlah_baris // MIN_SEMESTER_PER_MAHASISWA)
+
+    masuk = rng.choice(posisi_masuk, size=n_mhs)
+    sisa = len(SEMESTER_URUT) - masuk
+    # Lama studi 1..12 semester, dipotong sampai semester terakhir yang tersedia
+    lama = np.minimum(rng.integers(1, 13, size=n_mhs), sisa)
+
+    nim = np.repeat(np.arange(n_mhs) + 10_000_000, lama)
+    offset = np.arange(lama.sum()) - np.repeat(np.cumsum(lama) - lama, lama)
+    idx_semester = np.repeat(masuk, lama) + offset
+
+    # Sebagian mahasiswa cuti satu semester di tengah studi (baris dihapus)
+    cuti = (offset == 2) & (np.repeat(lama, lama) > 3) & (rng.random(len(nim)) < 0.1)
+    nim, idx_semester, masuk_baris = nim[~cuti], idx_semester[~cuti], np.repeat(masuk, lama)[~cuti]
+
+    semester = np.array(SEMESTER_URUT)[idx_semester].astype(int)
+    angkatan = 2000 + np.array([int(SEMESTER_URUT[i][:2]) for i in posisi_masuk])
+    angkatan = angkatan[np.searchsorted(posisi_masuk, masuk_baris)]
+
+    ips = np.round(np.clip(rng.normal(3.2, 0.45, size=len(nim)), 0, 4), 2)
+    ips[rng.random(len(nim)) < 0.02] = np.nan
+    df = pd.DataFrame({
+        "NIM": nim,
+        "ANGKATAN": angkatan,
+        "SEMESTER_AMBIL": semester,
+        "IPS": ips,
+        "SKS": rng.integers(12, 25, size=len(nim)),
+    })
+    # IPK = rata-rata kumulatif IPS (baris sudah urut per NIM dan semester)
+    terisi = df["IPS"].notna().groupby(df["NIM"]).cumsum()
+    df["IPK"] = (df["IPS"].fillna(0).groupby(df["NIM"]).cumsum() / terisi.replace(0, np.nan)).round(2)
+    return df[["NIM", "ANGKATAN", "SEMESTER_AMBIL", "IPS", "IPK", "SKS"]].iloc[:jumlah_baris]
+
+
+def buat_responden(nim, rasio_responden, rng):
+    """Membuat tabel survei untuk sebagian mahasiswa dengan kolom pertanyaan asli."""
+    nim = np.unique(nim)
+    n = max(1, int(len(nim) * rasio_responden))
+    data = {"Timestamp": pd.Timestamp("2024-06-01"), "NIM": rng.choice(nim, size=n, replace=False)}
+    for pertanyaan, (_, encoding) in SKEMA_SURVEI.items():
+        if encoding is None:
+            # Pertanyaan skala Likert 1-5
+            data[pertanyaan] = rng.integers(1, 6, size=n)
+        else:
+            pilihan = list(encoding)
+            data[pertanyaan] = np.array(pilihan, dtype=object)[rng.integers(0, len(pilihan), size=n)]
+    return pd.DataFrame(data)
+
+
+def buat_mata_kuliah():
+    return pd.DataFrame({
+        "KODE_MK": [f"SI{i:03d}" for i in range(1, 41)],
+        "NAMA_MK": [f"Mata Kuliah {i}" for i in range(1, 41)],
+        "SKS": [3] * 40,
+    })
+
+
+def simpan(transkrip, responden, output, format_file):
+    """Menyimpan tabel sebagai workbook XLSX, atau file CSV/Parquet terpisah dalam folder output."""
+    if format_file == "xlsx":
+        with pd.ExcelWriter(output) as writer:
+            transkrip.to_excel(writer, sheet_name=SHEET_TRANSKRIP, index=False)
+            buat_mata_kuliah().to_excel(writer, sheet_name="MataKuliah", index=False)
+            responden.to_excel(writer, sheet_name=SHEET_RESPONDEN, index=False)
+        return [output]
+
+    os.makedirs(output, exist_ok=True)
+    paths = []
+    for nama, tabel in (("Transkrip", transkrip), ("Responden", responden)):
+        path = os.path.join(output, f"{nama}.{format_file}")
+        if format_file == "csv":
+            tabel.to_csv(path, index=False)
+        else:
+            tabel.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def generate(jumlah_baris, rasio_responden=0.7, seed=0):
+    """Menghasilkan (transkrip, responden) sintetis dengan jumlah baris transkrip tertentu."""
+    rng = np.random.default_rng(seed)
+    transkrip = buat_transkrip(jumlah_baris, rng)
+    responden = buat_responden(transkrip["NIM"].to_numpy(), rasio_responden, rng)
+    return transkrip, responden
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baris", type=int, default=10_000, help="Jumlah baris transkrip (1.000 - 1.000.000)")
+    parser.add_argument("--rasio-responden", type=float, default=0.7, help="Proporsi mahasiswa yang mengisi survei")
+    parser.add_argument("--format", choices=["xlsx", "csv", "parquet"], default="xlsx")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True, help="File .xlsx, atau folder untuk CSV/Parquet")
+    args = parser.parse_args()
+
+    transkrip, responden = generate(args.baris, args.rasio_responden, args.seed)
+    for path in simpan(transkrip, responden, args.output, args.format):
+        print(path)
+    print(f"{len(transkrip)} baris transkrip, {transkrip['NIM'].nunique()} mahasiswa, {len(responden)} responden")
+
+
+if __name__ == "__main__":
+    main()
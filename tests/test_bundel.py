@@ -0,0 +1,126 @@
+"""Uji bundel dataset: round-trip, perataan data anggota, dan penolakan bundel yang tidak sesuai."""
+import io
+import json
+import os
+import struct
+import sys
+import zipfile
+
+import pandas as pd
+import pytest
+
+AKAR_REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, AKAR_REPO)
+sys.path.insert(0, os.path.join(AKAR_REPO, "benchmark"))
+
+import app  # noqa: E402
+from generate_data import generate  # noqa: E402
+
+
+def unggah(transkrip, responden):
+    """Tabel sebagai file CSV 'unggahan' yang dikenali baca_tabel dari namanya."""
+    files = []
+    for nama, tabel in (("Transkrip.csv", transkrip), ("Responden.csv", responden)):
+        f = io.BytesIO(tabel.to_csv(index=False).encode())
+        f.name = nama
+        files.append(f)
+    return files
+
+
+def sebagai_unggahan(isi, nama="dataset.zip"):
+    f = io.BytesIO(isi)
+    f.name = nama
+    return f
+
+
+@pytest.fixture(scope="module")
+def data():
+    return generate(2_000, seed=2)
+
+
+@pytest.fixture(scope="module")
+def frame(data):
+    df, df1, data_master, _, laporan_memori = app.proses_data(unggah(*data))
+    return df, df1, data_master, laporan_memori
+
+
+def test_round_trip_dari_unggahan_dan_path(frame, tmp_path):
+    isi = app.tulis_bundel(*frame, "a" * 64)
+    path = tmp_path / "dataset.zip"
+    path.write_bytes(isi)
+
+    for asal in (sebagai_unggahan(isi), path):
+        *hasil, manifest = app.baca_bundel(asal)
+        for nama, awal, dibaca in zip(app.FRAME_BUNDEL, frame, hasil):
+            pd.testing.assert_frame_equal(dibaca, awal, check_exact=True, obj=nama)
+        assert manifest["versi_skema"] == app.VERSI_SKEMA_BUNDEL
+        assert manifest["hash_sumber"] == "a" * 64
+        assert manifest["baris"] == {nama: len(f) for nama, f in zip(app.FRAME_BUNDEL, frame)}
+
+
+def test_data_anggota_rata_64_byte(frame):
+    isi = app.tulis_bundel(*frame, "a" * 64)
+    with zipfile.ZipFile(io.BytesIO(isi)) as zf:
+        anggota = [info for info in zf.infolist() if info.filename.endswith(".arrow")]
+    assert [info.filename for info in anggota] == [f"{nama}.arrow" for nama in app.FRAME_BUNDEL]
+    for info in anggota:
+        assert info.compress_type == zipfile.ZIP_STORED
+        panjang_nama, panjang_extra = struct.unpack_from("<HH", isi, info.header_offset + 26)
+        assert (info.header_offset + 30 + panjang_nama + panjang_extra) % 64 == 0
+
+
+def test_versi_skema_lain_ditolak(frame, monkeypatch):
+    monkeypatch.setattr(app, "VERSI_SKEMA_BUNDEL", app.VERSI_SKEMA_BUNDEL + 1)
+    isi = app.tulis_bundel(*frame, "a" * 64)
+    monkeypatch.undo()
+    with pytest.raises(ValueError, match="versi skema"):
+        app.baca_bundel(sebagai_unggahan(isi))
+
+
+def test_zip_tanpa_manifest_ditolak():
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as zf:
+        zf.writestr("df.arrow", b"")
+    with pytest.raises(ValueError, match="manifest.json"):
+        app.baca_bundel(sebagai_unggahan(output.getvalue()))
+
+
+@pytest.mark.parametrize(
+    "ubah, pesan",
+    [
+        (lambda df, df1, dm: (df.drop(columns="SKS"), df1, dm), "Kolom tabel 'df'"),
+        (lambda df, df1, dm: (df.assign(NIM=df["NIM"].astype(str)), df1, dm), "Tipe kolom tabel 'df'.*NIM"),
+        (lambda df, df1, dm: (df, df1.assign(TOTAL_SEMESTER=df1["TOTAL_SEMESTER"].astype(float)), dm),
+         "Tipe kolom tabel 'df1'.*TOTAL_SEMESTER"),
+        (lambda df, df1, dm: (df, df1, dm.drop(columns="IPS")), "Kolom tabel 'data_master'"),
+        (lambda df, df1, dm: (df, df1, dm.assign(kolom_asing=1.0)), "Kolom tabel 'data_master'"),
+        (lambda df, df1, dm: (df, df1, dm.assign(uang_saku=dm["uang_saku"].astype(str))),
+         "Tipe kolom tabel 'data_master'.*uang_saku"),
+    ],
+)
+def test_kolom_atau_tipe_tidak_sesuai_ditolak(frame, ubah, pesan):
+    df, df1, data_master, laporan_memori = frame
+    isi = app.tulis_bundel(*ubah(df, df1, data_master), laporan_memori, "a" * 64)
+    with pytest.raises(ValueError, match=pesan):
+        app.baca_bundel(sebagai_unggahan(isi))
+
+
+def test_hash_sumber_manifest_tidak_menjadi_kunci_registri(data, frame):
+    sumber = unggah(*data)
+    # Bundel palsu mengaku berasal dari file sumber, tetapi IPK-nya diubah
+    df, df1, data_master, laporan_memori = frame
+    palsu = app.tulis_bundel(df, df1.assign(IPK=0.5), data_master, laporan_memori, app.hash_file(sumber))
+    *_, kunci_palsu, _ = app.load_data_cached(sebagai_unggahan(palsu))
+    assert kunci_palsu == app.hash_file(sebagai_unggahan(palsu))
+
+    # Sesi lain yang mengunggah file sumber asli tidak boleh menerima data bundel palsu
+    app.lepas_dataset_sesi()
+    app.st.session_state.pop("pegangan_dataset", None)
+    _, df1_asli, *_, kunci, dari_registri = app.load_data_cached(sumber)
+    assert kunci == app.hash_file(sumber)
+    assert not dari_registri
+    pd.testing.assert_series_equal(df1_asli["IPK"], df1["IPK"])
+
+    # Isi manifest tetap terbaca sebagai informasi
+    with zipfile.ZipFile(io.BytesIO(palsu)) as zf:
+        assert json.loads(zf.read("manifest.json"))["hash_sumber"] == app.hash_file(sumber)
@@ -0,0 +1,44 @@
+"""Uji render_grafik: figure matplotlib selalu ditutup, termasuk saat pembuatan grafik gagal."""
+import os
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import pytest  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import app  # noqa: E402
+
+
+def test_figure_ditutup_dan_png_di_cache():
+    dipanggil = []
+
+    def buat():
+        dipanggil.append(1)
+        fig, ax = plt.subplots()
+        ax.plot([1, 2, 3])
+        return fig
+
+    sebelum = plt.get_fignums()
+    png = app.render_grafik(("uji", "berhasil"), buat)
+    assert png.startswith(b"\x89PNG")
+    assert plt.get_fignums() == sebelum
+    assert app.render_grafik(("uji", "berhasil"), buat) == png
+    assert len(dipanggil) == 1
+
+
+def test_figure_ditutup_saat_pembuatan_gagal():
+    def buat():
+        # Seperti grafik_*: figure dibuat dulu, lalu seaborn gagal
+        plt.subplots()
+        plt.subplots()
+        raise ValueError("seaborn gagal")
+
+    sebelum = plt.get_fignums()
+    with pytest.raises(ValueError, match="seaborn gagal"):
+        app.render_grafik(("uji", "gagal"), buat)
+    assert plt.get_fignums() == sebelum
+    assert app.cache_grafik().get(("uji", "gagal")) is None
@@ -0,0 +1,205 @@
+"""Uji konsistensi logika vektor terhadap perhitungan acuan yang sederhana.
+
+Data uji berasal dari benchmark/generate_data.generate, sehingga skemanya sama dengan
+workbook asli. Jalankan dari akar repositori: python -m pytest -q
+"""
+import io
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+AKAR_REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, AKAR_REPO)
+sys.path.insert(0, os.path.join(AKAR_REPO, "benchmark"))
+
+import app  # noqa: E402
+from generate_data import SEMESTER_URUT, generate  # noqa: E402
+
+JUMLAH_BARIS = 5_000
+
+
+def unggah(transkrip, responden):
+    """Tabel sebagai file CSV 'unggahan' yang dikenali baca_tabel dari namanya."""
+    files = []
+    for nama, tabel in (("Transkrip.csv", transkrip), ("Responden.csv", responden)):
+        f = io.BytesIO(tabel.to_csv(index=False).encode())
+        f.name = nama
+        files.append(f)
+    return files
+
+
+def polos(tabel):
+    """Kategori menjadi string dan indeks direset, agar frame dapat dibandingkan nilainya saja."""
+    tabel = tabel.copy()
+    for kolom in tabel.columns:
+        if isinstance(tabel[kolom].dtype, pd.CategoricalDtype):
+            tabel[kolom] = tabel[kolom].astype(str)
+    return tabel.reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def data():
+    transkrip, responden = generate(JUMLAH_BARIS, seed=1)
+    return transkrip, responden
+
+
+@pytest.fixture(scope="module")
+def hasil(data):
+    df, df1, data_master, _, _ = app.proses_data(unggah(*data))
+    return df, df1, data_master
+
+
+# --- Logika per baris versi awal aplikasi (acuan) ---
+def urutkan_semester(lst):
+    return sorted(set(lst), key=lambda x: SEMESTER_URUT.index(str(x)) if str(x) in SEMESTER_URUT else 999)
+
+
+def tentukan_status_per_baris(row):
+    total_sem = row["TOTAL_SEMESTER"]
+    sem_terakhir = str(row["SEMESTER_TERAKHIR"])
+    if total_sem == 7:
+        return "Lulus Lebih Awal"
+    elif total_sem == 8:
+        return "Lulus Tepat Waktu"
+    elif total_sem > 8:
+        return "Tidak Lulus Tepat Waktu"
+    if sem_terakhir in SEMESTER_URUT:
+        idx = SEMESTER_URUT.index(sem_terakhir)
+        if idx + 1 < len(SEMESTER_URUT):
+            if SEMESTER_URUT[idx + 1] not in [str(s) for s in row["SEMESTER_AMBIL"]]:
+                return "Dropout/Non-aktif"
+    return "Masih Aktif"
+
+
+def test_status_sama_dengan_logika_per_baris(data, hasil):
+    transkrip, _ = data
+    acuan = (
+        transkrip.groupby("NIM", as_index=False)
+        .agg({"ANGKATAN": "first", "SEMESTER_AMBIL": list, "IPS": "last", "IPK": "last", "SKS": "sum"})
+        .rename(columns={"SKS": "TOTAL_SKS"})
+    )
+    acuan["SEMESTER_AMBIL"] = acuan["SEMESTER_AMBIL"].apply(urutkan_semester)
+    acuan["SEMESTER_TERAKHIR"] = acuan["SEMESTER_AMBIL"].apply(lambda x: str(x[-1]))
+    acuan["TOTAL_SEMESTER"] = acuan["SEMESTER_AMBIL"].apply(len)
+    acuan["LAMA_KULIAH_TAHUN"] = acuan["TOTAL_SEMESTER"] / 2
+    acuan["KELULUSAN_STATUS"] = acuan.apply(tentukan_status_per_baris, axis=1)
+
+    _, df1, _ = hasil
+    kolom = ["NIM", "ANGKATAN", "IPS", "IPK", "TOTAL_SKS", "SEMESTER_TERAKHIR", "TOTAL_SEMESTER",
+             "LAMA_KULIAH_TAHUN", "KELULUSAN_STATUS"]
+    pd.testing.assert_frame_equal(polos(df1[kolom]), polos(acuan[kolom]), check_dtype=False)
+    urutan = app.urutan_dataset(hasil[0])
+    assert [app.semester_dari_mask(m, urutan) for m in df1["SEMESTER_MASK"]] == [
+        [str(s) for s in lst] for lst in acuan["SEMESTER_AMBIL"]
+    ]
+
+
+def transkrip_panjang(jumlah_semester):
+    """Transkrip dengan urutan semester sepanjang jumlah_semester; mahasiswa ke-i mengambil 4 semester mulai posisi i."""
+    kode = [f"{p // 2:02d}{p % 2 + 1}1" for p in range(20, 20 + jumlah_semester)]
+    baris = [
+        {"NIM": 1000 + i, "ANGKATAN": 2000 + int(kode[i][:2]), "SEMESTER_AMBIL": int(kode[j]),
+         "IPS": 3.0, "IPK": 3.0, "SKS": 20}
+        for i in range(jumlah_semester - 3) for j in range(i, i + 4)
+    ]
+    return pd.DataFrame(baris), kode
+
+
+def test_mask_tepat_di_batas_semester(data):
+    jumlah_semester = app.MAKS_SEMESTER_MASK
+    transkrip, kode = transkrip_panjang(jumlah_semester)
+    responden = data[1].head(len(transkrip["NIM"].unique())).assign(NIM=transkrip["NIM"].unique())
+    df, df1, _, _, _ = app.proses_data(unggah(transkrip, responden))
+
+    urutan = app.urutan_dataset(df)
+    assert urutan == kode
+    assert (df1["SEMESTER_MASK"] > 0).all()
+    assert [app.semester_dari_mask(m, urutan) for m in df1["SEMESTER_MASK"]] == [
+        kode[i:i + 4] for i in range(jumlah_semester - 3)
+    ]
+    # Hanya mahasiswa yang berhenti sebelum semester terakhir dataset yang dropout
+    assert (df1["KELULUSAN_STATUS"].astype(str) == "Dropout/Non-aktif").sum() == jumlah_semester - 4
+
+
+def test_urutan_melebihi_batas_mask_ditolak(data):
+    transkrip, _ = transkrip_panjang(app.MAKS_SEMESTER_MASK + 1)
+    with pytest.raises(ValueError, match="melebihi batas"):
+        app.proses_data(unggah(transkrip, data[1]))
+
+
+def test_tambah_semester_sama_dengan_proses_ulang(data, hasil):
+    transkrip, responden = data
+    terakhir = transkrip["SEMESTER_AMBIL"].astype(str) == SEMESTER_URUT[-1]
+    df, df1, data_master, _, _ = app.proses_data(unggah(transkrip[~terakhir], responden))
+    df, df1, data_master, _ = app.tambah_semester(df, df1, data_master, transkrip[terakhir])
+
+    df_penuh, df1_penuh, master_penuh = hasil
+    pd.testing.assert_frame_equal(polos(df1), polos(df1_penuh), check_dtype=False)
+    urut = ["NIM", "SEMESTER_AMBIL"]
+    pd.testing.assert_frame_equal(
+        polos(df).sort_values(urut, ignore_index=True),
+        polos(df_penuh).sort_values(urut, ignore_index=True),
+        check_dtype=False,
+    )
+    # Responden yang baru muncul di semester tambahan tidak punya baris survei di dataset inkremental
+    master_penuh = master_penuh[master_penuh["NIM"].isin(data_master["NIM"])]
+    pd.testing.assert_frame_equal(
+        polos(data_master.sort_values("NIM")), polos(master_penuh.sort_values("NIM")), check_dtype=False
+    )
+
+
+def test_tambah_semester_melebihi_batas_mask_ditolak(data):
+    transkrip, kode = transkrip_panjang(app.MAKS_SEMESTER_MASK - 2)
+    df, df1, data_master, _, _ = app.proses_data(unggah(transkrip, data[1]))
+    posisi = 20 + len(kode)
+
+    def semester_baru(p):
+        return pd.DataFrame({
+            "NIM": [1000], "ANGKATAN": [2010], "SEMESTER_AMBIL": [f"{p // 2:02d}{p % 2 + 1}1"],
+            "IPS": [3.0], "IPK": [3.0], "SKS": [20],
+        })
+
+    # Tepat mencapai batas masih diterima; satu semester lagi ditolak
+    df, df1, data_master, _ = app.tambah_semester(df, df1, data_master, semester_baru(posisi))
+    df, df1, data_master, _ = app.tambah_semester(df, df1, data_master, semester_baru(posisi + 1))
+    assert len(app.urutan_dataset(df)) == app.MAKS_SEMESTER_MASK
+    with pytest.raises(ValueError, match="melebihi batas"):
+        app.tambah_semester(df, df1, data_master, semester_baru(posisi + 2))
+
+
+def test_retensi_sama_dengan_hitungan_manual(data, hasil):
+    transkrip, _ = data
+    _, df1, _ = hasil
+    status = df1.set_index("NIM")["KELULUSAN_STATUS"].astype(str)
+    posisi = {kode: i for i, kode in enumerate(SEMESTER_URUT)}
+
+    jumlah = Counter()
+    for nim, baris in transkrip.groupby("NIM"):
+        diambil = {posisi[str(kode)] for kode in baris["SEMESTER_AMBIL"]}
+        awal, akhir = min(diambil), max(diambil)
+        for ke in range(len(SEMESTER_URUT) - awal):
+            pos = awal + ke
+            if pos in diambil:
+                keadaan = "Terdaftar"
+            elif pos < akhir:
+                keadaan = "Jeda (Cuti)"
+            elif status[nim] in app.STATUS_LULUS:
+                keadaan = "Lulus"
+            else:
+                keadaan = "Dropout/Non-aktif"
+            jumlah[(int(baris["ANGKATAN"].iat[0]), ke + 1, keadaan)] += 1
+
+    tabel = app.hitung_retensi_kohort(df1, app.urutan_dataset(hasil[0]))
+    hitung = {
+        (int(a), int(s), k): int(j)
+        for a, s, k, j in tabel[["ANGKATAN", "SEMESTER_KE", "KEADAAN", "JUMLAH"]].itertuples(index=False)
+        if j > 0
+    }
+    assert hitung == dict(jumlah)
+
+    total = tabel.groupby(["ANGKATAN", "SEMESTER_KE"])["PROPORSI"].sum()
+    np.testing.assert_allclose(total.to_numpy(), 1.0)